@@ -12,6 +12,7 @@ from oemof.tabular._facade import Facade
 from oemof_industry.mimo_converter import MIMO
 
 from data_adapter_oemof import calculations
+from data_adapter_oemof.utils import is_periodic
 
 logger = logging.getLogger()
 
@@ -28,6 +29,40 @@ class MappingError(Exception):
     """Raised if mapping fails"""
 
 
+class TimeseriesColumns:
+    """
+    Precomputed lookup of the timeseries column names of one process
+
+    Adapters only need to know which profile columns exist, not the timeseries
+    data itself. The lookup is built once per process and shared between all
+    adapters of that process.
+    """
+
+    __slots__ = ("columns", "_column_set")
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._column_set = frozenset(self.columns)
+
+    @classmethod
+    def from_timeseries(cls, timeseries: pd.DataFrame) -> "TimeseriesColumns":
+        return cls(timeseries.columns)
+
+    def __contains__(self, column) -> bool:
+        return column in self._column_set
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def get_regional(self, key: str, region) -> Optional[str]:
+        """Returns column `<key>_<region>` if it exists, else None"""
+        column = f"{key}_{region}"
+        return column if column in self._column_set else None
+
+
 class Adapter:
     type: str = "adapter"
     facade: Union[Facade, dataclasses.dataclass] = None
@@ -44,17 +79,25 @@ class Adapter:
         self,
         process_name: str,
         data: dict,
-        timeseries: pd.DataFrame,
+        timeseries: Union[pd.DataFrame, TimeseriesColumns],
         structure: dict,
         parameter_map: dict,
         bus_map: dict,
+        batch_calculations: bool = False,
     ):
         self.process_name = process_name
         self.data = data
-        self.timeseries = timeseries
+        self.timeseries_columns = (
+            timeseries
+            if isinstance(timeseries, TimeseriesColumns)
+            else TimeseriesColumns.from_timeseries(timeseries)
+        )
         self.structure = structure
         self.parameter_map = parameter_map
         self.bus_map = bus_map
+        # Default calculations are done for all components of a process at once
+        # (see `batch_pre_mapping_calculations`/`batch_post_mapping_calculations`)
+        self.batch_calculations = batch_calculations
         self.facade_dict = self.get_default_parameters()
 
     def get_default_parameters(self) -> dict:
@@ -76,7 +119,8 @@ class Adapter:
                 }
             )
 
-        defaults = self.default_post_mapping_calculations(defaults)
+        if not self.batch_calculations:
+            defaults = self.default_post_mapping_calculations(defaults)
         if not defaults["input_parameters"]:
             defaults.pop("input_parameters")
         if not defaults["output_parameters"]:
@@ -99,35 +143,44 @@ class Adapter:
         :return: str
             mapped key
         """
-        # 1.Check process-specific mappings first
-        if (
-            self.process_name in self.parameter_map
-            and key in self.parameter_map[self.process_name]
-        ):
-            return self.parameter_map[self.process_name][key]
-
-        # 2. Check adapter-specific mappings second
-        if (
-            self.__class__.__name__ in self.parameter_map
-            and key in self.parameter_map[self.__class__.__name__]
-        ):
-            return self.parameter_map[self.__class__.__name__][key]
-
-        # 3. Check facade-specific mappings third
-        if (
-            self.facade.__name__ in self.parameter_map
-            and key in self.parameter_map[self.facade.__name__]
-        ):
-            return self.parameter_map[self.facade.__name__][key]
-
-        # 4. Check default mappings fourth
-        if key in self.parameter_map.get("DEFAULT", []):
-            return self.parameter_map["DEFAULT"][key]
-
-        # 5. Use key if no mapping available
-        logger.debug(f"Key not found. Did not map '{key}'")
+        return self.map_process_key(self.process_name, self.parameter_map, key)
+
+    @classmethod
+    def map_process_key(cls, process_name: str, parameter_map: dict, key: str):
+        """Map key for given process without instantiating the adapter.
+        See `map_key`.
+
+        :param process_name: str
+        :param parameter_map: dict
+        :param key: str
+            key to be mapped
+        :return: str
+            mapped key
+        """
+        # Check process-, adapter-, facade-specific and default mappings in order
+        for section in cls.get_parameter_map_sections(process_name):
+            if section in parameter_map and key in parameter_map[section]:
+                return parameter_map[section][key]
+
+        # Use key if no mapping available
+        logger.debug(
+            "Key not found. Did not map '%s'",
+            key,
+            extra={"process_name": process_name},
+        )
         return key
 
+    @classmethod
+    def get_parameter_map_sections(cls, process_name: str) -> tuple:
+        """Sections of parameter map used to map keys of given process
+        (in order of precedence). See `map_process_key`.
+
+        :param process_name: str
+        :return: tuple
+            process name, adapter name, facade name and "DEFAULT"
+        """
+        return process_name, cls.__name__, cls.facade.__name__, "DEFAULT"
+
     def get_data(self, key, field_type: Optional[Type] = None):
         """
         Get data for key either from scalar data or timeseries data. Return
@@ -147,18 +200,26 @@ class Adapter:
         # 1.2 Check if mapped key is in timeseries data
         if self.is_sequence(field_type):
             # 1.2.1 Take key_region if exists
-            key = f"{key}_{self.get_data('region')}"
-            if key in self.timeseries.columns:
-                return key
+            region = self.get_data("region")
+            timeseries_key = self.timeseries_columns.get_regional(key, region)
+            if timeseries_key is not None:
+                return timeseries_key
             # 1.2.2 Take column name if only one time series is available
-            if len(self.timeseries.columns) == 1:
-                timeseries_key = self.timeseries.columns[0]
+            if len(self.timeseries_columns) == 1:
+                timeseries_key = self.timeseries_columns.columns[0]
                 logger.info(
                     "Key not found in timeseries. "
-                    f"Using existing timeseries column '{timeseries_key}'."
+                    "Using existing timeseries column '%s'.",
+                    timeseries_key,
+                    extra={"process_name": self.process_name},
                 )
                 return timeseries_key
-            logger.warning(f"Could not find timeseries entry for mapped key '{key}'")
+            logger.warning(
+                "Could not find timeseries entry for mapped key '%s_%s'",
+                key,
+                region,
+                extra={"process_name": self.process_name},
+            )
             return None
 
         # 2 Use defaults
@@ -167,7 +228,11 @@ class Adapter:
 
         # 3 Return None if no data is available
         logger.debug(
-            f"No {key} data in {self.process_name} as a {self.__class__.__name__}"
+            "No %s data in %s as a %s",
+            key,
+            self.process_name,
+            self.__class__.__name__,
+            extra={"process_name": self.process_name},
         )
         return None
 
@@ -207,7 +272,9 @@ class Adapter:
         ]
         if len(bus_occurrences_in_fields) == 0:
             logger.warning(
-                f"No busses found in facades fields for Dataadapter {self.__class__.__name__}"
+                "No busses found in facades fields for Dataadapter %s",
+                self.__class__.__name__,
+                extra={"process_name": self.process_name},
             )
 
         bus_dict = {}
@@ -278,7 +345,9 @@ class Adapter:
         def get_io_parameter_dict(parameters):
             io_dict = {}
             for param in parameters:
-                if input_parameter_value := self.get(param.name):
+                input_parameter_value = self.get(param.name)
+                # Periodic values are numpy arrays and cannot be tested for truth
+                if is_periodic(input_parameter_value) or input_parameter_value:
                     io_dict.update({param.name: input_parameter_value})
             return io_dict
 
@@ -298,7 +367,8 @@ class Adapter:
         :return: Dictionary for all fields that the facade can take and matching data
         """
 
-        self.default_pre_mapping_calculations()
+        if not self.batch_calculations:
+            self.default_pre_mapping_calculations()
 
         mapped_all_class_fields = {
             field.name: value
@@ -350,6 +420,83 @@ class Adapter:
 
         return mapped_defaults
 
+    @classmethod
+    def batch_pre_mapping_calculations(
+        cls, process_name: str, scalars: pd.DataFrame, parameter_map: dict
+    ) -> pd.DataFrame:
+        """
+        Batch version of `default_pre_mapping_calculations`
+        operating on the periodic scalars of all components of a process
+
+        Returns
+        -------
+        scalars with normalized activity bonds
+
+        """
+        return calculations.normalize_activity_bonds_frame(
+            scalars,
+            capacity_column=cls.map_process_key(
+                process_name, parameter_map, "capacity"
+            ),
+        )
+
+    @classmethod
+    def capacity_cost_calculations(
+        cls, process_name: str, scalars: pd.DataFrame, parameter_map: dict
+    ) -> pd.DataFrame:
+        """
+        Calculates capacity costs for all components of a process from overnight
+        costs, fixed costs, lifetime and wacc if capacity costs are not given.
+
+        Columns are found via the parameter map using the keys `capacity_cost`,
+        `overnight_cost`, `fixed_cost`, `lifetime` and `wacc`. As `overnight_cost`,
+        `lifetime` and `wacc` are not mapped by default, capacity costs are only
+        calculated if a (custom) parameter map maps them.
+
+        Returns
+        -------
+        scalars with capacity costs in the (mapped) capacity cost column
+
+        """
+
+        def map_column(key):
+            return cls.map_process_key(process_name, parameter_map, key)
+
+        return calculations.capacity_cost_frame(
+            scalars,
+            capacity_cost_column=map_column("capacity_cost"),
+            overnight_cost_column=map_column("overnight_cost"),
+            fixed_cost_column=map_column("fixed_cost"),
+            lifetime_column=map_column("lifetime"),
+            wacc_column=map_column("wacc"),
+            process_name=process_name,
+        )
+
+    @classmethod
+    def batch_post_mapping_calculations(
+        cls, process_name: str, elements: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Batch version of `default_post_mapping_calculations`
+        operating on the element frame of all components of a process
+
+        I. Decommissioning of existing Capacities
+        II. Rounding lifetime down to integers
+
+        Returns
+        -------
+
+        """
+        # I:
+        if process_name[-1] == "0":
+            elements = calculations.decommission_frame(process_name, elements)
+
+        # II:
+        if "lifetime" in elements.columns:
+            elements = calculations.floor_lifetime_frame(elements)
+
+        return elements
+
 
 class DispatchableAdapter(Adapter):
     """
@@ -504,6 +651,18 @@ class MIMOAdapter(Adapter):
         """
         pass
 
+    @classmethod
+    def batch_pre_mapping_calculations(
+        cls, process_name: str, scalars: pd.DataFrame, parameter_map: dict
+    ) -> pd.DataFrame:
+        """
+        Mimo adapter specific batch pre calculations
+        Returns
+        -------
+
+        """
+        return scalars
+
     def get_default_parameters(self) -> dict:
         defaults = super().get_default_parameters()
         defaults["groups"] = self.get_groups()
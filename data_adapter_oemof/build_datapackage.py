@@ -1,7 +1,17 @@
+import collections
+import concurrent.futures
 import dataclasses
+import fnmatch
+import gzip
+import hashlib
+import importlib.util
+import itertools
+import json
 import os
+import posixpath
 import warnings
-from typing import Optional, Type
+import weakref
+from typing import Callable, Iterable, Iterator, Optional, Type, Union
 
 import numpy as np
 import pandas as pd
@@ -11,9 +21,515 @@ from datapackage import Package
 
 from data_adapter_oemof.adapters import FACADE_ADAPTERS
 from data_adapter_oemof.adapters import Adapter as FacadeAdapter
+from data_adapter_oemof.adapters import TimeseriesColumns
+from data_adapter_oemof.cache import ProcessCache
 from data_adapter_oemof.calculations import handle_nans
+from data_adapter_oemof.log_summary import summarize_logs
+from data_adapter_oemof.progress import Progress, ProgressReporter
 from data_adapter_oemof.settings import BUS_MAP, PARAMETER_MAP, PROCESS_ADAPTER_MAP
-from data_adapter_oemof.utils import convert_mixed_types_to_same_length
+from data_adapter_oemof.utils import (
+    convert_mixed_types_to_same_length,
+    flatten_timeseries_columns,
+    lists_to_periodic_values,
+    periodic_values_to_lists,
+)
+
+
+def _is_missing(value) -> bool:
+    """Checks whether a scalar component value is unset (None or NaN)"""
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _iterate_processes(
+    get_process: Callable, process_names: Iterable[str], prefetch: int = 0
+) -> Iterator[tuple]:
+    """
+    Yields name and data of every process in given order.
+
+    If `prefetch` is set, the next `prefetch` processes are read in a background
+    thread while the current process is adapted. Processes are read one after
+    another by a single thread, thus `get_process` does not have to be thread-safe.
+
+    Parameters
+    ----------
+    get_process: Callable
+        Function returning process data for a process name
+    process_names: Iterable[str]
+        Names of processes to read
+    prefetch: int
+        Number of processes to read ahead, 0 reads synchronously
+
+    Returns
+    -------
+    Iterator of (process_name, process_data)
+    """
+    if prefetch < 1:
+        for process_name in process_names:
+            yield process_name, get_process(process_name)
+        return
+
+    process_names = iter(process_names)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        pending = collections.deque(
+            (process_name, executor.submit(get_process, process_name))
+            for process_name in itertools.islice(process_names, prefetch)
+        )
+        try:
+            while pending:
+                process_name, future = pending.popleft()
+                # Refill queue before waiting to keep reading ahead
+                for next_process_name in itertools.islice(process_names, 1):
+                    pending.append(
+                        (
+                            next_process_name,
+                            executor.submit(get_process, next_process_name),
+                        )
+                    )
+                yield process_name, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _select_processes(
+    process_names: Iterable[str], patterns: Union[str, Iterable[str]]
+) -> list:
+    """Returns process names matching any of the given glob patterns"""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    patterns = list(patterns)
+    return [
+        process_name
+        for process_name in process_names
+        if any(fnmatch.fnmatchcase(process_name, pattern) for pattern in patterns)
+    ]
+
+
+def _get_column_regions(columns: pd.Index, known_regions: Iterable[str]) -> list:
+    """
+    Returns region of every timeseries column, None for columns without region
+
+    Regions of MultiIndex columns are taken from level "region" (or the second
+    level, which becomes the suffix of flattened columns). Regions of flat
+    columns are found by suffix "_<region>" of any of the known regions
+    (longest match first, so regions may contain "_").
+    """
+    if isinstance(columns, pd.MultiIndex):
+        level = "region" if "region" in columns.names else min(columns.nlevels, 2) - 1
+        regions = []
+        for value in columns.get_level_values(level):
+            if isinstance(value, (list, tuple)) and len(value) == 1:
+                value = value[0]
+            regions.append(None if _is_missing(value) or value == "" else str(value))
+        return regions
+    known_regions = sorted(set(map(str, known_regions)), key=len, reverse=True)
+    return [
+        next(
+            (region for region in known_regions if str(column).endswith(f"_{region}")),
+            None,
+        )
+        for column in columns
+    ]
+
+
+def _filter_process_data(
+    scalars: pd.DataFrame,
+    timeseries: pd.DataFrame,
+    regions: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+) -> tuple:
+    """
+    Restricts scalars and timeseries of a process to given regions and years
+
+    Scalars are filtered by columns "region" and "year" (if present),
+    timeseries by region of columns (see `_get_column_regions`, regions of the
+    process are taken from scalars) and by year of index. Timeseries columns
+    without region are kept.
+
+    Returns
+    -------
+    tuple of filtered scalars and timeseries
+    """
+    scalar_rows = np.ones(len(scalars), dtype=bool)
+    timeseries_rows = np.ones(len(timeseries), dtype=bool)
+    timeseries_columns = np.ones(len(timeseries.columns), dtype=bool)
+    if regions is not None:
+        regions = set(regions)
+        process_regions = []
+        if "region" in scalars.columns:
+            scalar_rows &= scalars["region"].isin(regions).to_numpy()
+            process_regions = scalars["region"].dropna().unique()
+        timeseries_columns &= np.array(
+            [
+                region is None or region in regions
+                for region in _get_column_regions(timeseries.columns, process_regions)
+            ],
+            dtype=bool,
+        )
+    if years is not None:
+        years = set(years)
+        if "year" in scalars.columns:
+            scalar_rows &= scalars["year"].isin(years).to_numpy()
+        if len(timeseries):
+            timeseries_rows &= pd.to_datetime(timeseries.index).year.isin(years)
+    if not scalar_rows.all():
+        scalars = scalars.loc[scalar_rows].reset_index(drop=True)
+    if not (timeseries_rows.all() and timeseries_columns.all()):
+        timeseries = timeseries.loc[timeseries_rows, timeseries_columns].copy()
+    return scalars, timeseries
+
+
+def _align_timeseries(
+    process_name: str,
+    timeseries: pd.DataFrame,
+    timeindex: Optional[pd.DatetimeIndex],
+) -> tuple:
+    """
+    Converts index of timeseries to shared timeindex
+
+    First timeseries defines the shared timeindex. Following timeseries get the
+    very same index instance, thus later concatenation and slicing of sequences
+    needs no alignment. Timeseries holding the same timestamps in another order
+    are reindexed.
+
+    Returns
+    -------
+    tuple of aligned timeseries and shared timeindex
+
+    Raises
+    ------
+    ValueError if timestamps of timeseries differ from shared timeindex
+    """
+    if timeseries.empty:
+        return timeseries, timeindex
+    index = pd.DatetimeIndex(pd.to_datetime(timeseries.index), name="timeindex")
+    if timeindex is None:
+        timeindex = index
+    elif not index.equals(timeindex):
+        if (
+            len(index) != len(timeindex)
+            or index.has_duplicates
+            or not index.isin(timeindex).all()
+        ):
+            raise ValueError(
+                f"Timeindex of process '{process_name}' ({len(index)} timestamps "
+                f"from {index.min()} to {index.max()}) does not match timeindex of "
+                f"previous processes ({len(timeindex)} timestamps from "
+                f"{timeindex.min()} to {timeindex.max()})."
+            )
+        timeseries = timeseries.set_axis(index, axis=0, copy=False).reindex(timeindex)
+    return timeseries.set_axis(timeindex, axis=0, copy=False), timeindex
+
+
+def _prepare_process_data(
+    process_name: str,
+    process_data,
+    timeindex: Optional[pd.DatetimeIndex],
+    regions: Optional[Iterable[str]] = None,
+    years: Optional[Iterable[int]] = None,
+) -> tuple:
+    """
+    Filters, flattens and aligns process data read by adapter
+
+    Returns
+    -------
+    tuple of scalars, timeseries and shared timeindex
+    """
+    # Filtered before flattening to find regions in MultiIndex columns
+    scalars, timeseries = _filter_process_data(
+        process_data.scalars, process_data.timeseries, regions=regions, years=years
+    )
+    if isinstance(timeseries.columns, pd.MultiIndex):
+        # Flattened without modifying data read by adapter
+        timeseries = timeseries.set_axis(
+            flatten_timeseries_columns(timeseries.columns),
+            axis=1,
+            copy=False,
+        )
+    timeseries, timeindex = _align_timeseries(process_name, timeseries, timeindex)
+    return scalars, timeseries, timeindex
+
+
+AdaptedProcess = collections.namedtuple(
+    typename="AdaptedProcess",
+    field_names=["element", "busses", "foreign_keys", "sequence"],
+)
+
+
+@dataclasses.dataclass
+class Scenario:
+    """
+    Variant of a datapackage build, see `DataPackage.build_scenarios`
+
+    Attributes
+    ----------
+    process_adapter_map: dict
+        Process adapter assignments overriding the base process adapter map
+    parameter_map: dict
+        Parameter map replacing the base parameter map (if set)
+    scalars: dict
+        Scalar overrides per process, i.e. {"process": {"lifetime": 30}}.
+        Values are set for all rows (regions and years) of the process.
+    location_to_save_to: str
+        Default destination used when saving the datapackage of the scenario
+    """
+
+    process_adapter_map: dict = dataclasses.field(default_factory=dict)
+    parameter_map: Optional[dict] = None
+    scalars: dict = dataclasses.field(default_factory=dict)
+    location_to_save_to: Optional[str] = None
+
+
+def _get_nbytes(*dataframes: pd.DataFrame) -> int:
+    """Returns (shallow) memory usage of given dataframes in bytes"""
+    return int(sum(df.memory_usage(index=True).sum() for df in dataframes))
+
+
+def _hash_resource(
+    data: pd.DataFrame, sequence: bool = False, index: bool = True
+) -> str:
+    """
+    Hashes content of an element or sequence resource
+
+    Sequences are hashed with pandas (row hashes including index, unless `index`
+    is unset), elements are hashed by their csv representation, as they hold
+    periodic values.
+    """
+    content_hash = hashlib.sha256(repr(list(data.columns)).encode())
+    if sequence:
+        content_hash.update(
+            pd.util.hash_pandas_object(data, index=index).to_numpy().tobytes()
+        )
+    else:
+        content_hash.update(
+            periodic_values_to_lists(data).to_csv(index=False, sep=";").encode()
+        )
+    return content_hash.hexdigest()
+
+
+def _evaluate_tsam_config(period_sequence: pd.DataFrame, config: dict) -> tuple:
+    """
+    Aggregates sequences of one period with given tsam configuration
+
+    Module level function to be run in worker processes.
+
+    Returns number of aggregated timesteps and accuracy indicators per sequence
+    """
+    aggregation = tsam.TimeSeriesAggregation(period_sequence, **config)
+    typical_periods = aggregation.createTypicalPeriods()
+    return len(typical_periods), aggregation.accuracyIndicators()
+
+
+def _get_tsam_timeincrement(
+    typical_periods: pd.DataFrame, resolution: float
+) -> np.ndarray:
+    """
+    Returns timeincrement (in hours) of typical periods created by tsam
+
+    Segmented typical periods hold the duration of each segment (in timesteps)
+    in index level "Segment Duration", otherwise every timestep lasts
+    `resolution` hours. Timeincrements are integers if all are full hours.
+    """
+    if "Segment Duration" in (typical_periods.index.names or []):
+        durations = typical_periods.index.get_level_values("Segment Duration")
+        timeincrement = np.asarray(durations, dtype=float) * resolution
+    else:
+        timeincrement = np.full(len(typical_periods), float(resolution))
+    if np.all(timeincrement == np.round(timeincrement)):
+        timeincrement = timeincrement.astype(int)
+    return timeincrement
+
+
+# Supported compressions of sequence resources and their file extensions
+SEQUENCE_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+# Names of compressions in datapackage descriptors (as known by tabulator)
+DESCRIPTOR_COMPRESSIONS = {"gzip": "gz", "zstd": "zstd"}
+
+
+def _iterate_sequence_blocks(sequence: pd.DataFrame, chunksize: int) -> Iterator[bytes]:
+    """Formats sequence as csv in blocks of `chunksize` rows"""
+    for start in range(0, max(len(sequence), 1), chunksize):
+        stop = start + chunksize
+        yield sequence.iloc[start:stop].to_csv(
+            sep=";",
+            header=start == 0,
+            index_label="timeindex",
+            date_format="%Y-%m-%dT%H:%M:%SZ",
+        ).encode("utf-8")
+
+
+def _write_sequence_csv(
+    sequence: pd.DataFrame,
+    path: str,
+    chunksize: int,
+    compression: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Writes sequence to csv in blocks of `chunksize` rows
+
+    Only one block at a time is formatted, which keeps memory usage flat for
+    long (i.e. 15-minute resolution over several decades) sequences.
+
+    Compressed sequences are compressed using multiple threads:
+    gzip blocks are compressed in parallel as independent gzip members (which
+    concatenated form a valid gzip file), zstd uses multi-threaded compression
+    of `zstandard`.
+
+    Returns number of bytes written.
+    """
+    blocks = _iterate_sequence_blocks(sequence, chunksize)
+    with open(path, "wb") as f:
+        if compression is None:
+            for block in blocks:
+                f.write(block)
+        elif compression == "gzip":
+            # Same default as ThreadPoolExecutor, also limits blocks in flight
+            workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+            with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+                pending = collections.deque()
+                for block in blocks:
+                    # mtime is fixed to get reproducible files
+                    pending.append(pool.submit(gzip.compress, block, mtime=0))
+                    if len(pending) > workers:
+                        f.write(pending.popleft().result())
+                while pending:
+                    f.write(pending.popleft().result())
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "Package `zstandard` is needed for zstd compression. "
+                    "Install it via extra `compression`."
+                ) from e
+            compressor = zstandard.ZstdCompressor(threads=max_workers or -1)
+            with compressor.stream_writer(f, closefd=False) as writer:
+                for block in blocks:
+                    writer.write(block)
+        return f.tell()
+
+
+def _get_sequence_resource_descriptor(
+    resource_name: str, sequence: pd.DataFrame, path: str, compression: str
+) -> dict:
+    """
+    Creates descriptor of compressed sequence resource
+
+    Compressed resources are not found by `Package.infer`, therefore their
+    descriptors are built like inferred ones of uncompressed sequences.
+    """
+    return {
+        "encoding": "utf-8",
+        "format": "csv",
+        "mediatype": "text/csv",
+        "compression": DESCRIPTOR_COMPRESSIONS[compression],
+        "name": resource_name,
+        "path": path,
+        "profile": "tabular-data-resource",
+        "schema": {
+            "fields": [{"format": "default", "name": "timeindex", "type": "datetime"}]
+            + [
+                {"format": "default", "name": str(column), "type": "number"}
+                for column in sequence.columns
+            ],
+            "missingValues": [""],
+        },
+    }
+
+
+def _read_sequence_resource(path: str, resource: dict) -> pd.DataFrame:
+    """
+    Reads (compressed) sequence resource with all value columns typed as float.
+    Uses pyarrow csv engine if available.
+    """
+    fields = [field["name"] for field in resource["schema"]["fields"]]
+    pandas_compressions = {
+        descriptor_compression: compression
+        for compression, descriptor_compression in DESCRIPTOR_COMPRESSIONS.items()
+    }
+    compression = resource.get("compression", "infer")
+    sequence = pd.read_csv(
+        path,
+        sep=";",
+        compression=pandas_compressions.get(compression, compression),
+        dtype={field: "float64" for field in fields if field != "timeindex"},
+        engine="pyarrow" if importlib.util.find_spec("pyarrow") else "c",
+    )
+    # Timestamps are saved in UTC notation ("Z") but used as naive timestamps
+    # (pyarrow engine already parses them as UTC timestamps)
+    timeindex = pd.to_datetime(sequence.pop("timeindex"), format="ISO8601", utc=True)
+    sequence.index = pd.DatetimeIndex(
+        timeindex.dt.tz_localize(None).astype("datetime64[ns]"), name="timeindex"
+    )
+    return sequence
+
+
+def _join_yearly_sequence_resources(resources: list, yearly_resources: dict) -> list:
+    """
+    Joins descriptors of yearly sequence resources to multipart resources
+
+    Parameters
+    ----------
+    resources: list
+        Resource descriptors of datapackage
+    yearly_resources: dict
+        Names of multipart resources by names of yearly resources
+
+    Returns
+    -------
+    list of resource descriptors, yearly resources of a process are replaced by
+    one resource listing the yearly files (ordered by year) in `path`
+    """
+    joined_resources = {}
+    joined = []
+    for resource in resources:
+        resource_name = yearly_resources.get(resource["name"])
+        if resource_name is None:
+            joined.append(resource)
+            continue
+        if resource_name not in joined_resources:
+            joined_resources[resource_name] = {
+                **resource,
+                "name": resource_name,
+                "path": [],
+            }
+            joined.append(joined_resources[resource_name])
+        joined_resources[resource_name]["path"].append(resource["path"])
+    for resource in joined_resources.values():
+        resource["path"].sort()
+    return joined
+
+
+def _get_resource_paths(resource: dict) -> list:
+    """Returns path(s) of (multipart) resource as list"""
+    path = resource["path"]
+    return path if isinstance(path, list) else [path]
+
+
+def _read_resource(location: str, resource: dict) -> tuple:
+    """
+    Reads a single datapackage resource
+
+    Sequences of multipart resources are read part by part and joined.
+
+    Returns
+    -------
+    tuple of resource kind ("elements", "sequences", "periods" or "tsam")
+    and resource data
+    """
+    paths = [os.path.join(location, path) for path in _get_resource_paths(resource)]
+    path = paths[0]
+    kind = os.path.normpath(path).split(os.sep)[-2]
+    if kind == "sequences":
+        sequences = [_read_sequence_resource(path, resource) for path in paths]
+        return kind, sequences[0] if len(sequences) == 1 else pd.concat(sequences)
+    if kind == "periods":
+        periods = pd.read_csv(path, sep=";", index_col="timeindex", parse_dates=True)
+        return kind, periods
+    if kind == "tsam":
+        return kind, pd.read_csv(path, sep=";", index_col="periods")
+    return kind, lists_to_periodic_values(pd.read_csv(path, sep=";"))
 
 
 # Define a function to aggregate differing values into a list
@@ -21,7 +537,7 @@ def _listify_to_periodic(group_df) -> pd.Series:
     """
     Method to aggregate scalar values to periodical values grouped by "name"
     For each group, check whether scalar values differ over the years.
-    If yes, write as lists, if not, the original value is written.
+    If yes, write as periodic values (numpy arrays), if not, the original value is written.
 
     If there is no "year" column, assume the data is already aggregated and
     pass as given.
@@ -62,18 +578,22 @@ def _listify_to_periodic(group_df) -> pd.Series:
         # Lists and Series can be passed for special Facades only.
         # Sequences shall be passed as sequences (via links.csv):
         elif any(
-            [isinstance(col_entry, (pd.Series, list)) for col_entry in group_df[col]]
+            [
+                isinstance(col_entry, (pd.Series, list, np.ndarray))
+                for col_entry in group_df[col]
+            ]
         ):
             values = group_df[col].explode().unique()
         else:
             values = group_df[col].unique()
+        # Periodic values are kept as numpy arrays and serialized when saving
         if len(values) > 1:
-            if isinstance(group_df[col].iloc[0], list):
-                unique_values[col] = list(group_df[col].apply(lambda x: x[0]))
+            if isinstance(group_df[col].iloc[0], (list, np.ndarray)):
+                unique_values[col] = group_df[col].apply(lambda x: x[0]).to_numpy()
             else:
-                unique_values[col] = list(group_df[col])
+                unique_values[col] = group_df[col].to_numpy()
         else:
-            if isinstance(group_df[col].iloc[0], list):
+            if isinstance(group_df[col].iloc[0], (list, np.ndarray)):
                 unique_values[col] = group_df[col].iat[0][0]
             else:
                 unique_values[col] = group_df[col].iat[0]
@@ -95,19 +615,56 @@ class DataPackage:
     periods: pd.DataFrame()
     location_to_save_to: str = None
     tsa_parameters: pd.DataFrame = None
+    # index of sequences periods are derived from (see `update_periods`)
+    _periods_index: Optional[pd.Index] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # content hashes of resources and weak references to the hashed frames by
+    # resource key (see `get_resource_hash`)
+    _resource_hashes: dict = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     @staticmethod
-    def __split_timeseries_into_years(parametrized_sequences):
-        split_dataframes = {}
-        for sequence_name, sequence_dataframe in parametrized_sequences.items():
-            # Group the DataFrame by year using pd.Grouper
-            grouped = sequence_dataframe.resample("Y")
+    def split_timeseries_into_years(parametrized_sequences: dict) -> dict:
+        """
+        Splits sequences into yearly sequences without copying data
+
+        Yearly sequences are positional slices (views) of the original sequences.
+        Year boundaries are calculated once per index and reused for all sequences
+        sharing the same index.
 
-            # Iterate over the groups and store each year's DataFrame
-            for year, group in grouped:
-                split_dataframes[sequence_name + "_" + str(year.year)] = group.copy()
+        Parameters
+        ----------
+        parametrized_sequences: dict
+            Sequences per process, indexed by (sorted) timeindex
 
-        return split_dataframes
+        Returns
+        -------
+        dict of dicts holding yearly sequences per process and year
+        """
+        year_slices = {}
+        split_sequences = {}
+        for sequence_name, sequence in parametrized_sequences.items():
+            index_id = id(sequence.index)
+            if index_id not in year_slices:
+                years = pd.DatetimeIndex(pd.to_datetime(sequence.index)).year
+                if not years.is_monotonic_increasing:
+                    raise ValueError(
+                        f"Index of sequence '{sequence_name}' must be sorted "
+                        "to split it into years."
+                    )
+                starts = np.flatnonzero(np.diff(years, prepend=np.nan) != 0)
+                stops = np.append(starts[1:], len(years))
+                year_slices[index_id] = {
+                    int(years[start]): slice(start, stop)
+                    for start, stop in zip(starts, stops)
+                }
+            split_sequences[sequence_name] = {
+                year: sequence.iloc[year_slice]
+                for year, year_slice in year_slices[index_id].items()
+            }
+        return split_sequences
 
     @staticmethod
     def get_foreign_keys(facade_adapter: FacadeAdapter, components: list) -> list:
@@ -131,87 +688,312 @@ class DataPackage:
         if facade_adapter is None:
             return []
         new_foreign_keys = []
-        components = pd.DataFrame(components)
         for bus in facade_adapter.get_busses().keys():
             new_foreign_keys.append(
                 {"fields": bus, "reference": {"fields": "name", "resource": "bus"}}
             )
 
         for field in facade_adapter.get_fields():
-            if (
-                facade_adapter.is_sequence(field.type)
-                and field.name in components.columns
-                and pd.api.types.infer_dtype(components[field.name]) == "string"
-            ):
-                if all(components[field.name].isin(facade_adapter.timeseries.columns)):
-                    new_foreign_keys.append(
-                        {
-                            "fields": field.name,
-                            "reference": {
-                                "resource": f"{facade_adapter.process_name}_sequence"
-                            },
-                        }
-                    )
-                elif any(
-                    components[field.name].isin(facade_adapter.timeseries.columns)
-                ):
-                    # Todo clean up on examples:
-                    #   -remove DE from hackerthon or
-                    #   -create propper example with realistic project data
-                    warnings.warn(
-                        "Not all profile columns are set within the given profiles."
-                        f" Please check if there is a timeseries for every Component in "
-                        f"{facade_adapter.process_name}"
+            if not facade_adapter.is_sequence(field.type):
+                continue
+            # Collect set values of the field directly from the component dicts,
+            # missing entries count as not found in the timeseries
+            values = [
+                component[field.name]
+                for component in components
+                if field.name in component and not _is_missing(component[field.name])
+            ]
+            if not values or not all(isinstance(value, str) for value in values):
+                continue
+            found = [value in facade_adapter.timeseries_columns for value in values]
+            if len(values) == len(components) and all(found):
+                new_foreign_keys.append(
+                    {
+                        "fields": field.name,
+                        "reference": {
+                            "resource": f"{facade_adapter.process_name}_sequence"
+                        },
+                    }
+                )
+            elif any(found):
+                # Todo clean up on examples:
+                #   -remove DE from hackerthon or
+                #   -create propper example with realistic project data
+                warnings.warn(
+                    "Not all profile columns are set within the given profiles."
+                    f" Please check if there is a timeseries for every Component in "
+                    f"{facade_adapter.process_name}"
+                )
+                new_foreign_keys.append(
+                    {
+                        "fields": field.name,
+                        "reference": {
+                            "resource": f"{facade_adapter.process_name}_sequence"
+                        },
+                    }
+                )
+            else:
+                # The Field is allowed to be a timeseries
+                # -> and likely is a supposed to be a timeseries
+                # but a scalar or `unused` is found.
+                pass
+        return new_foreign_keys
+
+    def validate_foreign_keys(self) -> list:
+        """
+        Checks foreign keys of all elements against referenced resources in memory
+
+        Bus references are checked against names of bus elements, sequence
+        references against columns of the referenced process sequence. All values
+        of a foreign key field are checked at once using hashed lookups. Missing
+        values (NaN) are ignored.
+
+        Returns
+        -------
+        list of violations (empty if all foreign keys are valid)
+        """
+        violations = []
+        for resource_name, resource_foreign_keys in self.foreign_keys.items():
+            elements = self.parametrized_elements.get(resource_name)
+            if elements is None:
+                violations.append(
+                    f"Foreign keys are given for unknown resource '{resource_name}'."
+                )
+                continue
+            for foreign_key in resource_foreign_keys:
+                field = foreign_key["fields"]
+                reference = foreign_key["reference"]
+                referenced_resource = reference["resource"]
+                if field not in elements.columns:
+                    violations.append(
+                        f"Field '{field}' of foreign key is missing in resource "
+                        f"'{resource_name}'."
                     )
-                    new_foreign_keys.append(
-                        {
-                            "fields": field.name,
-                            "reference": {
-                                "resource": f"{facade_adapter.process_name}_sequence"
-                            },
-                        }
+                    continue
+                if referenced_resource.endswith("_sequence"):
+                    sequence = self.parametrized_sequences.get(
+                        referenced_resource.removesuffix("_sequence")
                     )
+                    referenced_values = None if sequence is None else sequence.columns
                 else:
-                    # The Field is allowed to be a timeseries
-                    # -> and likely is a supposed to be a timeseries
-                    # but a scalar or `unused` is found.
-                    pass
-        return new_foreign_keys
+                    referenced_elements = self.parametrized_elements.get(
+                        referenced_resource
+                    )
+                    referenced_values = (
+                        None
+                        if referenced_elements is None
+                        else referenced_elements[reference.get("fields", "name")]
+                    )
+                if referenced_values is None:
+                    violations.append(
+                        f"Resource '{referenced_resource}' referenced by field "
+                        f"'{field}' of resource '{resource_name}' does not exist."
+                    )
+                    continue
+
+                values = elements[field]
+                values = values[~values.map(_is_missing)]
+                is_label = values.map(lambda value: isinstance(value, str))
+                found = is_label.copy()
+                found[is_label] = values[is_label].isin(set(referenced_values))
+                if not found.all():
+                    violations.append(
+                        f"Values {values[~found].tolist()} of field '{field}' in "
+                        f"resource '{resource_name}' are not found in resource "
+                        f"'{referenced_resource}'."
+                    )
+        return violations
+
+    def get_resource_hash(self, process_name: str, sequence: bool = False) -> str:
+        """
+        Returns content hash of element or sequence of a process
+
+        Hashes are cached per data frame object, thus frames must not be changed
+        in place after hashing (replace them instead). Only weak references to
+        hashed frames are kept, so replaced frames are freed.
+
+        Parameters
+        ----------
+        process_name: str
+            Name of element resource or process of sequence
+        sequence: bool
+            Hash sequence instead of element
+
+        Returns
+        -------
+        Hex digest of resource content
+        """
+        data = (
+            self.parametrized_sequences[process_name]
+            if sequence
+            else self.parametrized_elements[process_name]
+        )
+        key = (process_name, sequence)
+        cached = self._resource_hashes.get(key)
+        if cached is None or cached[0]() is not data:
+            cached = (weakref.ref(data), _hash_resource(data, sequence=sequence))
+            self._resource_hashes[key] = cached
+        return cached[1]
+
+    def get_unchanged_resources(self, base: "DataPackage") -> tuple:
+        """
+        Compares elements and sequences with those of a base datapackage
+
+        Frames shared with the base (i.e. from `build_scenarios`) are unchanged
+        without hashing, others are compared by content hash.
+
+        Parameters
+        ----------
+        base: DataPackage
+
+        Returns
+        -------
+        tuple of sets holding names of unchanged elements and processes with
+        unchanged sequences
+        """
+
+        def is_unchanged(data, base_data, process_name, sequence):
+            if base_data is None:
+                return False
+            if data is base_data:
+                return True
+            return self.get_resource_hash(
+                process_name, sequence
+            ) == base.get_resource_hash(process_name, sequence)
+
+        unchanged_elements = {
+            process_name
+            for process_name, element in self.parametrized_elements.items()
+            if is_unchanged(
+                element,
+                base.parametrized_elements.get(process_name),
+                process_name,
+                False,
+            )
+        }
+        unchanged_sequences = {
+            process_name
+            for process_name, sequence in self.parametrized_sequences.items()
+            if is_unchanged(
+                sequence,
+                base.parametrized_sequences.get(process_name),
+                process_name,
+                True,
+            )
+        }
+        return unchanged_elements, unchanged_sequences
 
     @staticmethod
     def get_periods_from_parametrized_sequences(
         parametrized_sequences,
     ) -> pd.DataFrame:
         """
-        Takes Dictionary with all parametrized sequences per technology and tries to find periods
-        csv. First sequence found will be to dervie periods.
+        Takes Dictionary with all parametrized sequences per technology and derives
+        periods csv from their common index.
+
+        All non-empty sequences must share the same index. Each year of the index
+        makes up a period. Timeincrement is the time step (in hours) to the next
+        timestamp within the same period, the last timestamp of a period reuses the
+        previous time step (periods with a single timestamp get timeincrement 1).
+        Timeincrements are integers if all steps are full hours.
         ----------
         parametrized_sequences
 
         Returns
         -------
+        pd.DataFrame holding periods and timeincrement indexed by timeindex
 
+        Raises
+        ------
+        ValueError if sequences have differing indices
         """
-        for process_name, sequence in parametrized_sequences.items():
-            if len(sequence) != 0:
-                sequence = pd.DataFrame(index=pd.to_datetime(sequence.index))
-                # create mapping to count up unique years
-                year_mapping = {
-                    year: i for i, year in enumerate(sequence.index.year.unique())
-                }
-                # Map unique years to sequence instead of using groupby
-                sequence["periods"] = sequence.index.year.map(year_mapping)
-                sequence["timeincrement"] = 1
-                sequence.index.name = "timeindex"
-                return sequence
-            else:
-                pass
-        return pd.DataFrame()
+        sequences = [
+            (process_name, sequence)
+            for process_name, sequence in parametrized_sequences.items()
+            if len(sequence) != 0
+        ]
+        if not sequences:
+            return pd.DataFrame()
+        reference_name, reference = sequences[0]
+        differing_sequences = [
+            process_name
+            for process_name, sequence in sequences[1:]
+            if sequence.index is not reference.index
+            and not sequence.index.equals(reference.index)
+        ]
+        if differing_sequences:
+            raise ValueError(
+                f"Indices of sequences {differing_sequences} differ from index of "
+                f"sequence '{reference_name}'. All sequences must share the same "
+                "timeindex."
+            )
+
+        timeindex = reference.index
+        if not isinstance(timeindex, pd.DatetimeIndex):
+            timeindex = pd.DatetimeIndex(pd.to_datetime(timeindex), name="timeindex")
+        elif timeindex.name != "timeindex":
+            timeindex = timeindex.rename("timeindex")
+        # Count up unique years in order of appearance
+        periods = pd.factorize(timeindex.year)[0]
+        steps = np.diff(timeindex.values) / np.timedelta64(1, "h")
+        timeincrement = np.full(len(timeindex), np.nan)
+        timeincrement[:-1] = np.where(periods[1:] == periods[:-1], steps, np.nan)
+        timeincrement = (
+            pd.Series(timeincrement).groupby(periods).ffill().fillna(1).to_numpy()
+        )
+        if np.all(timeincrement == np.round(timeincrement)):
+            timeincrement = timeincrement.astype(int)
+
+        return pd.DataFrame(
+            {"periods": periods, "timeincrement": timeincrement}, index=timeindex
+        )
+
+    def update_periods(self) -> pd.DataFrame:
+        """
+        Updates periods from parametrized sequences
+
+        Periods are cached on the datapackage together with the index they are
+        derived from and only derived again if the index of any sequence differs.
+
+        Returns
+        -------
+        Updated periods
+        """
+        indices = self._get_sequence_indices()
+        if self._periods_are_current(indices):
+            return self.periods
+        self.periods = self.get_periods_from_parametrized_sequences(
+            self.parametrized_sequences
+        )
+        self._periods_index = indices[0] if indices else None
+        return self.periods
+
+    def _get_sequence_indices(self) -> list:
+        return [
+            sequence.index
+            for sequence in self.parametrized_sequences.values()
+            if len(sequence) != 0
+        ]
+
+    def _periods_are_current(self, indices: list) -> bool:
+        """Checks if periods were derived from (all) given sequence indices"""
+        return self._periods_index is not None and all(
+            index is self._periods_index or index.equals(self._periods_index)
+            for index in indices
+        )
 
     def save_datapackage_to_csv(
         self,
         location_to_save_to: str = None,
         datapackage_name: str = "datapackage.json",
+        chunksize: int = 100_000,
+        compression: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        split_sequences_by_year: bool = False,
+        validate: bool = False,
+        base: Optional["DataPackage"] = None,
+        base_datapackage_name: str = "datapackage.json",
+        progress: Optional[Callable[[Progress], None]] = None,
     ) -> None:
         """
         Saving the datapackage to a given destination in oemof.tabular readable format
@@ -225,6 +1007,45 @@ class DataPackage:
             String to where the datapackage save to. More convenient to use os.path.
             If last level of folder stucture does not exist, it will be created
             (as well as /elements and /sequences)
+        datapackage_name: str
+            Name of the datapackage descriptor file
+        chunksize: int
+            Number of rows of sequences written at once
+        compression: str
+            Compression of sequence resources, either "gzip" or "zstd" (needs
+            `zstandard`). Compressed sequences are saved as
+            "<process>_sequence.csv.gz" or ".csv.zst" and marked with
+            `compression` ("gz" or "zstd") in the datapackage descriptor.
+            gz compressed resources can be read by `datapackage`, zstd
+            compressed ones only via `DataPackage.from_directory` (i.e. not
+            directly by oemof.tabular).
+        max_workers: int
+            Number of threads used to compress sequences
+        split_sequences_by_year: bool
+            If set, sequences are saved in one file per process and year
+            "<process>_sequence_<year>.csv". The files of a process form the
+            multipart resource "<process>_sequence" (`path` lists the yearly
+            files), thus foreign keys of elements stay valid and the datapackage
+            can be read by `datapackage` (and oemof.tabular) as usual.
+            Compressed multipart resources can only be read via
+            `DataPackage.from_directory`.
+        validate: bool
+            If set, foreign keys are validated (see `validate_foreign_keys`)
+            before anything is written
+        base: DataPackage
+            If given, a delta datapackage is saved: Elements and sequences
+            equal to those of `base` (see `get_unchanged_resources`) are not
+            written, instead the descriptor references the resources of the
+            saved base datapackage (relative to `location_to_save_to`).
+            Base must have been saved to its `location_to_save_to` before.
+            Note that relative paths outside of the datapackage are not allowed by
+            the datapackage specification: such datapackages can be read via
+            `DataPackage.from_directory` or `datapackage.Package(..., unsafe=True)`.
+        base_datapackage_name: str
+            Name of the descriptor file of the base datapackage
+        progress: Callable
+            Called with a `Progress` (stage "save") after every written element
+            and sequence resource, including rows and bytes written so far
 
         Returns
         -------
@@ -232,6 +1053,17 @@ class DataPackage:
 
         """
 
+        if compression is not None and compression not in SEQUENCE_COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}'. "
+                f"Supported compressions are: {list(SEQUENCE_COMPRESSIONS)}"
+            )
+
+        if validate and (violations := self.validate_foreign_keys()):
+            raise ValueError(
+                "Invalid foreign keys found in datapackage:\n" + "\n".join(violations)
+            )
+
         # check if datapackage already has defined its destination
         if location_to_save_to:
             pass
@@ -253,6 +1085,15 @@ class DataPackage:
         os.makedirs(periods_path, exist_ok=True)
         os.makedirs(tsam_path, exist_ok=True)
 
+        base_resources = []
+        unchanged_elements, unchanged_sequences = set(), set()
+        if base is not None:
+            base_resources, unchanged_elements, unchanged_sequences = (
+                self._get_base_resources(
+                    base, location_to_save_to, base_datapackage_name
+                )
+            )
+
         if not self.periods.empty:
             self.periods.to_csv(
                 os.path.join(
@@ -269,26 +1110,85 @@ class DataPackage:
                 os.path.join(tsam_path, "tsa_parameters.csv"), sep=";"
             )
 
+        changed_elements = {
+            process_name: element
+            for process_name, element in self.parametrized_elements.items()
+            if process_name not in unchanged_elements
+        }
+        changed_sequences = {
+            process_name: sequence
+            for process_name, sequence in self.parametrized_sequences.items()
+            if process_name not in unchanged_sequences
+        }
+        # Maps names of yearly sequence resources to their multipart resource
+        yearly_resources = {}
+        if split_sequences_by_year:
+            sequence_resources = {}
+            for process_name, yearly_sequences in self.split_timeseries_into_years(
+                changed_sequences
+            ).items():
+                for year, yearly_sequence in yearly_sequences.items():
+                    resource_name = f"{process_name}_sequence_{year}"
+                    sequence_resources[resource_name] = yearly_sequence
+                    yearly_resources[resource_name] = f"{process_name}_sequence"
+        else:
+            sequence_resources = {
+                f"{process_name}_sequence": sequence
+                for process_name, sequence in changed_sequences.items()
+            }
+        reporter = ProgressReporter(
+            progress, "save", len(changed_elements) + len(sequence_resources)
+        )
+
         # Save elements to elements folder named by keys + .csv
-        for process_name, process_adapted_data in self.parametrized_elements.items():
-            process_adapted_data.to_csv(
-                os.path.join(elements_path, f"{process_name}.csv"),
+        for process_name, process_adapted_data in changed_elements.items():
+            element_path = os.path.join(elements_path, f"{process_name}.csv")
+            periodic_values_to_lists(process_adapted_data).to_csv(
+                element_path,
                 index=False,
                 sep=";",
             )
+            reporter.update(
+                process_name,
+                rows=len(process_adapted_data),
+                nbytes=os.path.getsize(element_path) if reporter.active else 0,
+            )
 
         # Save Sequences to sequence folder named as keys + _sequence.csv
-        for process_name, process_adapted_data in self.parametrized_sequences.items():
-            process_adapted_data.to_csv(
-                os.path.join(sequences_path, f"{process_name}_sequence.csv"),
-                sep=";",
-                index_label="timeindex",
-                date_format="%Y-%m-%dT%H:%M:%SZ",
+        # (+ _year if split by year, + extension of compression)
+        compressed_resources = []
+        for resource_name, process_adapted_data in sequence_resources.items():
+            file_name = f"{resource_name}.csv"
+            if compression is not None:
+                file_name += SEQUENCE_COMPRESSIONS[compression]
+                compressed_resources.append(
+                    _get_sequence_resource_descriptor(
+                        resource_name,
+                        process_adapted_data,
+                        f"data/sequences/{file_name}",
+                        compression,
+                    )
+                )
+            nbytes = _write_sequence_csv(
+                process_adapted_data,
+                os.path.join(sequences_path, file_name),
+                chunksize=chunksize,
+                compression=compression,
+                max_workers=max_workers,
+            )
+            reporter.update(
+                resource_name, rows=len(process_adapted_data), nbytes=nbytes
             )
 
         # From saved elements and keys create a Package
         package = Package(base_path=location_to_save_to)
         package.infer(pattern="**/*.csv")
+        package.descriptor["resources"].extend(compressed_resources)
+        package.descriptor["resources"].extend(base_resources)
+        if yearly_resources:
+            package.descriptor["resources"] = _join_yearly_sequence_resources(
+                package.descriptor["resources"], yearly_resources
+            )
 
         # Add foreign keys from self to Package
         for resource in package.descriptor["resources"]:
@@ -315,12 +1215,67 @@ class DataPackage:
                 )
 
         # re-initialize Package with added foreign keys and save datapackage.json
-        Package(package.descriptor).save(
+        # (paths to base resources are outside of datapackage, thus "unsafe")
+        Package(package.descriptor, unsafe=base is not None).save(
             os.path.join(location_to_save_to, datapackage_name)
         )
 
         return None
 
+    def _get_base_resources(
+        self,
+        base: "DataPackage",
+        location_to_save_to: str,
+        base_datapackage_name: str,
+    ) -> tuple:
+        """
+        Collects descriptors of unchanged resources from saved base datapackage
+
+        Returns
+        -------
+        tuple of base resource descriptors (with paths relative to
+        `location_to_save_to`), names of unchanged elements and processes with
+        unchanged sequences
+        """
+        if base.location_to_save_to is None:
+            raise ValueError(
+                "Base datapackage must be saved (to its location_to_save_to) "
+                "before saving a delta datapackage."
+            )
+        with open(
+            os.path.join(base.location_to_save_to, base_datapackage_name),
+            encoding="utf-8",
+        ) as f:
+            base_descriptor = json.load(f)
+        unchanged_elements, unchanged_sequences = self.get_unchanged_resources(base)
+        relative_path = os.path.relpath(
+            base.location_to_save_to, location_to_save_to
+        ).replace(os.sep, "/")
+
+        base_resources = []
+        referenced_elements, referenced_sequences = set(), set()
+        for resource in base_descriptor["resources"]:
+            paths = _get_resource_paths(resource)
+            kind = paths[0].split("/")[-2]
+            if kind == "elements" and resource["name"] in unchanged_elements:
+                referenced_elements.add(resource["name"])
+            elif kind == "sequences":
+                process_name = resource["name"].removesuffix("_sequence")
+                if process_name not in unchanged_sequences:
+                    continue
+                referenced_sequences.add(process_name)
+            else:
+                continue
+            resource = dict(resource)
+            paths = [
+                posixpath.normpath(posixpath.join(relative_path, path))
+                for path in paths
+            ]
+            resource["path"] = paths if isinstance(resource["path"], list) else paths[0]
+            base_resources.append(resource)
+        # Resources missing in saved base are written
+        return base_resources, referenced_elements, referenced_sequences
+
     @staticmethod
     def yearly_scalars_to_periodic_values(scalar_dataframe) -> pd.DataFrame:
         """
@@ -351,74 +1306,124 @@ class DataPackage:
         """
         identifiers = ["region", "carrier", "tech"]
         # Check if the identifiers exist if not they will be omitted
-        for poss, existing in enumerate(
-            [id in scalar_dataframe.columns for id in identifiers]
-        ):
-            if existing:
-                continue
-            else:
-                scalar_dataframe[identifiers[poss]] = identifiers[poss]
+        # (added to a new frame, as scalars may be shared between builds)
+        scalar_dataframe = scalar_dataframe.assign(
+            **{
+                identifier: identifier
+                for identifier in identifiers
+                if identifier not in scalar_dataframe.columns
+            }
+        )
 
         scalar_dataframe = (
             scalar_dataframe.groupby(["region", "carrier", "tech"])
             .apply(lambda x: _listify_to_periodic(x))
             .reset_index(drop=True)
         )
-        scalar_dataframe = scalar_dataframe.apply(convert_mixed_types_to_same_length)
+        # Only object columns can mix periodic values and scalars
+        for column in scalar_dataframe.select_dtypes(include="object").columns:
+            scalar_dataframe[column] = convert_mixed_types_to_same_length(
+                scalar_dataframe[column]
+            )
 
         return scalar_dataframe
 
     def time_series_aggregation(
-        self, tsam_config: str, location_to_save_to: str = None
+        self,
+        tsam_config: str,
+        location_to_save_to: str = None,
+        progress: Optional[Callable[[Progress], None]] = None,
+        **save_options,
     ):
         """
         Aggregates time series in datapackage and saves the new datapackage with updated
         (sequence)Resources as well as aggregated sequence resources.
+
+        Periods with identical sequence values (i.e. the same weather year used for
+        every period) and identical tsam configuration are clustered only once,
+        the result (typical periods and cluster order) is reused and re-indexed
+        for the other periods.
+
+        Typical periods are indexed by the first timestamps of their period, thus
+        timestamps do not reflect the durations of timesteps. Instead, timeincrement
+        of periods is set from the length of timesteps (tsam resolution) and, if
+        segmentation is used, from the duration of each segment.
+
         Parameters
         ----------
         tsam_config
         destination
+        progress
+            Called with a `Progress` (stage "tsam") after every aggregated period
+            and passed to `save_datapackage_to_csv` (stage "save")
+        save_options
+            Passed to `save_datapackage_to_csv` (i.e. compression)
 
         Returns
         -------
 
         """
-        # Refactor sequences into one Dataframe
-        sequences = pd.concat(
-            self.parametrized_sequences.values(),
-            axis=1,
-            keys=self.parametrized_sequences.keys(),
-        )
-        # Setting sequence indices to be same as periods
-        sequences.index = self.periods.index
-        # Group sequences by Periods
+        period_sequences = self._get_period_sequences()
         tsam_aggregated_typical_periods = []
         tsa_parameters = []
-        for period in pd.unique(self.periods["periods"]):
+        periods = list(period_sequences)
+        reporter = ProgressReporter(progress, "tsam", len(periods))
+        # Typical periods, parameters and timeincrement by hash of period values
+        # and tsam config
+        aggregations = {}
+        timeincrements = []
+        for period, period_sequence in period_sequences.items():
             # Saving the old Index to have it for later periods creation
-            index_old = self.periods.index[self.periods["periods"] == period]
-            period_sequence = sequences.loc[index_old]
-            # Aggregate
-            aggregation = tsam.TimeSeriesAggregation(
-                period_sequence, **tsam_config[period]
+            index_old = period_sequence.index
+            aggregation_key = (
+                _hash_resource(period_sequence, sequence=True, index=False),
+                json.dumps(tsam_config[period], sort_keys=True, default=str),
             )
-            tsa_parameters.append(
-                {
+            if aggregation_key in aggregations:
+                # Reuse clustering of identical period, only index is replaced
+                typical_periods, period_parameters, timeincrement = aggregations[
+                    aggregation_key
+                ]
+                typical_periods = typical_periods.copy()
+                period_parameters = {
+                    **period_parameters,
+                    "timeindex": period_sequence.index,
+                }
+            else:
+                # Aggregate
+                aggregation = tsam.TimeSeriesAggregation(
+                    period_sequence, **tsam_config[period]
+                )
+                period_parameters = {
                     "timesteps_per_period": aggregation.hoursPerPeriod,
                     "order": aggregation.clusterOrder,
                     "timeindex": aggregation.timeIndex,
                 }
-            )
-            aggregation = aggregation.createTypicalPeriods()
+                typical_periods = aggregation.createTypicalPeriods()
+                timeincrement = _get_tsam_timeincrement(
+                    typical_periods, aggregation.resolution
+                )
+                aggregations[aggregation_key] = (
+                    typical_periods,
+                    period_parameters,
+                    timeincrement,
+                )
+            tsa_parameters.append(period_parameters)
+            timeincrements.append(timeincrement)
             # Use old Index with as many as needed entries
-            aggregation.index = index_old[: len(aggregation)]
-            tsam_aggregated_typical_periods.append(aggregation)
+            typical_periods.index = index_old[: len(typical_periods)]
+            tsam_aggregated_typical_periods.append(typical_periods)
+            reporter.update(
+                str(period),
+                rows=len(period_sequence),
+                nbytes=_get_nbytes(period_sequence) if reporter.active else 0,
+            )
         # Aggregate split periods back together again
         tsam_aggregated_typical_periods = pd.concat(
             tsam_aggregated_typical_periods, ignore_index=False
         )
         tsa_parameters = pd.DataFrame(tsa_parameters)
-        tsa_parameters.index = list(pd.unique(self.periods["periods"]))
+        tsa_parameters.index = list(periods)
         tsa_parameters.index.name = "periods"
         self.tsa_parameters = tsa_parameters
 
@@ -435,12 +1440,121 @@ class DataPackage:
             # Remove disturbing Multiindex again
             sequence.columns = sequence.columns.droplevel()
             self.parametrized_sequences[sequence_file_name] = sequence
-        # Recreate Periods
-        self.periods = self.get_periods_from_parametrized_sequences(
-            self.parametrized_sequences
-        )
+        # Recreate Periods, timeincrement is given by aggregation (not by index)
+        self.update_periods()
+        self.periods["timeincrement"] = np.concatenate(timeincrements)
         # Save with newly introduced tsam trigger
-        self.save_datapackage_to_csv(location_to_save_to=location_to_save_to)
+        self.save_datapackage_to_csv(
+            location_to_save_to=location_to_save_to, progress=progress, **save_options
+        )
+
+    def _get_period_sequences(self, update_periods: bool = True) -> dict:
+        """Returns all sequences joined into one frame (column MultiIndex of
+        process and sequence column) per period
+
+        Periods are derived from (and validated against) sequence index, they
+        are only stored on the datapackage if `update_periods` is set."""
+        if update_periods:
+            periods = self.update_periods()
+        elif self._periods_are_current(self._get_sequence_indices()):
+            periods = self.periods
+        else:
+            periods = self.get_periods_from_parametrized_sequences(
+                self.parametrized_sequences
+            )
+        # Refactor sequences into one Dataframe
+        sequences = pd.concat(
+            self.parametrized_sequences.values(),
+            axis=1,
+            keys=self.parametrized_sequences.keys(),
+        )
+        # Group sequences by Periods
+        return {
+            period: sequences.loc[periods.index[periods["periods"] == period]]
+            for period in pd.unique(periods["periods"])
+        }
+
+    def sweep_time_series_aggregation(
+        self,
+        tsam_config: Union[list, dict],
+        grid: dict,
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Evaluates a grid of tsam configurations on the sequences in memory
+
+        Every combination of parameter values in `grid` overrides the tsam
+        configuration of every period. Combinations are aggregated in parallel
+        processes, nothing is saved and the datapackage is not changed.
+        Periods with identical sequence values are aggregated once per
+        combination (see `time_series_aggregation`).
+
+        Parameters
+        ----------
+        tsam_config: list or dict
+            tsam configuration per period, as in `time_series_aggregation`
+        grid: dict
+            Lists of parameter values to evaluate by tsam parameter name,
+            i.e. {"noTypicalPeriods": [4, 8, 12], "noSegments": [6, 12]}
+        max_workers: int
+            Number of processes to aggregate in
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per combination with the grid parameters, resulting number of
+            timesteps (summed over periods) and accuracy indicators of tsam
+            ("RMSE", "RMSE_duration", "MAE"), which are the maximum over all
+            sequences and periods. Rows are sorted by number of timesteps,
+            thus the first row meeting an error target is the smallest model::
+
+                sweep = datapackage.sweep_time_series_aggregation(config, grid)
+                best = sweep[sweep["RMSE"] <= 0.05].iloc[0]
+        """
+        period_sequences = self._get_period_sequences(update_periods=False)
+        # Identical periods are evaluated once and counted per occurrence
+        unique_periods = collections.defaultdict(list)
+        for period, period_sequence in period_sequences.items():
+            key = (
+                _hash_resource(period_sequence, sequence=True, index=False),
+                json.dumps(tsam_config[period], sort_keys=True, default=str),
+            )
+            unique_periods[key].append(period)
+
+        combinations = [
+            dict(zip(grid.keys(), values))
+            for values in itertools.product(*grid.values())
+        ]
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as pool:
+            futures = {
+                (number, key): pool.submit(
+                    _evaluate_tsam_config,
+                    period_sequences[periods[0]],
+                    {**tsam_config[periods[0]], **combination},
+                )
+                for number, combination in enumerate(combinations)
+                for key, periods in unique_periods.items()
+            }
+            results = []
+            for number, combination in enumerate(combinations):
+                timesteps = 0
+                accuracy = []
+                for key, periods in unique_periods.items():
+                    period_timesteps, period_accuracy = futures[(number, key)].result()
+                    timesteps += period_timesteps * len(periods)
+                    accuracy.append(period_accuracy)
+                results.append(
+                    {
+                        **combination,
+                        "timesteps": timesteps,
+                        **pd.concat(accuracy).max().to_dict(),
+                    }
+                )
+        return (
+            pd.DataFrame(results)
+            .sort_values("timesteps", kind="stable")
+            .reset_index(drop=True)
+        )
 
     @classmethod
     def build_datapackage(
@@ -450,6 +1564,12 @@ class DataPackage:
         parameter_map: Optional[dict] = PARAMETER_MAP,
         bus_map: Optional[dict] = BUS_MAP,
         location_to_save_to: str = None,
+        prefetch: int = 0,
+        cache_dir: Optional[str] = None,
+        processes: Optional[Union[str, Iterable[str]]] = None,
+        regions: Optional[Iterable[str]] = None,
+        years: Optional[Iterable[int]] = None,
+        progress: Optional[Callable[[Progress], None]] = None,
     ):
         """
         Creating a Datapackage from the oemof_data_adapter that fits oemof.tabular Datapackages.
@@ -468,6 +1588,30 @@ class DataPackage:
             Make sure to map "sequence" entries on "sequence profile names" (see example)
         bus_map
             Maps facade bus names to adapter bus names, if not set default mapping is used
+        location_to_save_to
+            Default destination used when saving the datapackage
+        prefetch
+            Number of processes read ahead from the collection in a background thread
+            while the current process is adapted. Default 0 reads synchronously.
+        cache_dir
+            If set, process data is cached in parquet format within this directory
+            and read from cache in following builds of the same collection
+            (see `ProcessCache`). Needs `pyarrow`.
+        processes
+            Glob pattern (or list of patterns) of processes to build,
+            i.e. "ind_steel_*". Not matching processes are not read at all.
+        regions
+            Regions to build. Scalars and timeseries of other regions are dropped
+            directly after reading a process.
+        years
+            Years to build. Scalars and timeseries of other years are dropped
+            directly after reading a process.
+        progress
+            Called with a `Progress` (stage "build") after every built process,
+            including rows and bytes of process data read so far
+
+        Log records of adapters are rate-limited per message and process and
+        summarized once at the end of the build (see `summarize_logs`).
 
         Returns
         -------
@@ -475,76 +1619,343 @@ class DataPackage:
 
         """
 
-        def _reduce_lists(x):
-            """Unnest list of single tuple or list of single list"""
-            if isinstance(x[0], (list, tuple)) and len(x[0]) == 1:
-                x = x.map(lambda x: x[0])
-            return x
-
-        parametrized_elements = {"bus": []}
-        parametrized_sequences = {}
-        foreign_keys = {}
-        # Iterate Elements
-        for process_name, struct in adapter.structure.processes.items():
-            process_data = adapter.get_process(process_name)
-            timeseries = process_data.timeseries
-            if isinstance(timeseries.columns, pd.MultiIndex):
-                timeseries.columns = (
-                    _reduce_lists(timeseries.columns.get_level_values(0))
-                    + "_"
-                    + _reduce_lists(timeseries.columns.get_level_values(1))
+        get_process = (
+            ProcessCache(adapter, cache_dir).get_process
+            if cache_dir
+            else adapter.get_process
+        )
+        # All sequences share this index (set by first timeseries)
+        timeindex = None
+        structure_processes = adapter.structure.processes
+        process_names = list(structure_processes.keys())
+        if processes is not None:
+            process_names = _select_processes(process_names, processes)
+        reporter = ProgressReporter(progress, "build", len(process_names))
+        adapted_processes = {}
+        with summarize_logs("build"):
+            for process_name, process_data in _iterate_processes(
+                get_process, process_names, prefetch=prefetch
+            ):
+                scalars, timeseries, timeindex = _prepare_process_data(
+                    process_name, process_data, timeindex, regions=regions, years=years
                 )
-            facade_adapter_name: str = process_adapter_map[process_name]
-            facade_adapter: Type[FacadeAdapter] = FACADE_ADAPTERS[facade_adapter_name]
-            component_adapter: Optional[FacadeAdapter] = None
-            components = []
-            process_busses = []
-            process_scalars = cls.yearly_scalars_to_periodic_values(
-                process_data.scalars
-            )
-            # Build class from adapter with Mapper and add up for each component within the Element
-            for component_data in process_scalars.to_dict(orient="records"):
-                component_adapter: FacadeAdapter = facade_adapter(
+                if scalars.empty:
+                    # Process does not exist in selected regions and years
+                    reporter.update(process_name)
+                    continue
+                adapted_processes[process_name] = cls._adapt_process(
                     process_name=process_name,
-                    data=component_data,
+                    scalars=scalars,
                     timeseries=timeseries,
-                    structure=struct,
+                    struct=structure_processes[process_name],
+                    facade_adapter=FACADE_ADAPTERS[process_adapter_map[process_name]],
                     parameter_map=parameter_map,
                     bus_map=bus_map,
                 )
-                components.append(component_adapter.facade_dict)
-                # Fill with all buses occurring, needed for foreign keys as well!
-                process_busses += list(component_adapter.get_busses().values())
-
-            process_busses = list(np.unique(process_busses))
-            parametrized_elements["bus"] += process_busses
-
-            # getting foreign keys with last component
-            # foreign keys have to be equal for every component within a Process
-            # as foreign key columns cannot have mixed meaning.
-            # thus reading foreign keys only from last facade adapter is sufficient.
-            foreign_keys[process_name] = cls.get_foreign_keys(
-                component_adapter, components
+                reporter.update(
+                    process_name,
+                    rows=len(scalars) + len(timeseries),
+                    nbytes=_get_nbytes(scalars, timeseries) if reporter.active else 0,
+                )
+        return cls._from_adapted_processes(
+            adapted_processes, adapter, location_to_save_to
+        )
+
+    @classmethod
+    def build_scenarios(
+        cls,
+        adapter: Adapter,
+        scenarios: dict,
+        process_adapter_map: Optional[dict] = PROCESS_ADAPTER_MAP,
+        parameter_map: Optional[dict] = PARAMETER_MAP,
+        bus_map: Optional[dict] = BUS_MAP,
+        prefetch: int = 0,
+        cache_dir: Optional[str] = None,
+        processes: Optional[Union[str, Iterable[str]]] = None,
+        regions: Optional[Iterable[str]] = None,
+        years: Optional[Iterable[int]] = None,
+        progress: Optional[Callable[[Progress], None]] = None,
+    ) -> dict:
+        """
+        Builds datapackages for several scenario variants at once.
+
+        Process data is read from the collection only once. Each process is
+        adapted once with the base maps and the result is shared by all scenarios
+        not affecting it. Only processes affected by a scenario (changed adapter
+        assignment, changed parameter map sections used by the process or scalar
+        overrides) are adapted again for that scenario, on new frames, leaving
+        shared data untouched (copy-on-write). Shared element and sequence frames
+        must be treated as read-only (copy before modifying them in place).
+
+        Parameters
+        ----------
+        adapter: Adapter
+            Adapter from data_adapter, see `build_datapackage`
+        scenarios: dict
+            Scenario variants (`Scenario`) by scenario name
+        process_adapter_map
+            Base process adapter map, see `build_datapackage`
+        parameter_map
+            Base parameter map, see `build_datapackage`
+        bus_map
+            Bus map shared by all scenarios, see `build_datapackage`
+        prefetch, cache_dir, processes, regions, years
+            See `build_datapackage`
+        progress
+            Called with a `Progress` (stage "build") after every read process
+
+        Returns
+        -------
+        dict of DataPackage by scenario name
+        """
+        get_process = (
+            ProcessCache(adapter, cache_dir).get_process
+            if cache_dir
+            else adapter.get_process
+        )
+        timeindex = None
+        structure_processes = adapter.structure.processes
+        process_names = list(structure_processes.keys())
+        if processes is not None:
+            process_names = _select_processes(process_names, processes)
+        reporter = ProgressReporter(progress, "build", len(process_names))
+        process_data = {}
+        for process_name, data in _iterate_processes(
+            get_process, process_names, prefetch=prefetch
+        ):
+            scalars, timeseries, timeindex = _prepare_process_data(
+                process_name, data, timeindex, regions=regions, years=years
+            )
+            if not scalars.empty:
+                process_data[process_name] = (scalars, timeseries)
+            reporter.update(
+                process_name,
+                rows=len(scalars) + len(timeseries),
+                nbytes=_get_nbytes(scalars, timeseries) if reporter.active else 0,
             )
 
-            parametrized_elements[process_name] = pd.DataFrame(components)
-            if not timeseries.empty:
-                parametrized_sequences.update({process_name: timeseries})
-        # Create Bus Element from all unique `busses` found in elements
-        parametrized_elements["bus"] = pd.DataFrame(
+        # Processes adapted with base maps, shared between scenarios
+        base_processes = {}
+        datapackages = {}
+        with summarize_logs("build of scenarios"):
+            for scenario_name, scenario in scenarios.items():
+                scenario_adapter_map = {
+                    **process_adapter_map,
+                    **scenario.process_adapter_map,
+                }
+                scenario_parameter_map = (
+                    parameter_map
+                    if scenario.parameter_map is None
+                    else scenario.parameter_map
+                )
+                adapted_processes = {}
+                for process_name, (scalars, timeseries) in process_data.items():
+                    facade_adapter_name = scenario_adapter_map[process_name]
+                    facade_adapter = FACADE_ADAPTERS[facade_adapter_name]
+                    scalar_overrides = scenario.scalars.get(process_name)
+                    is_affected = (
+                        bool(scalar_overrides)
+                        or facade_adapter_name != process_adapter_map.get(process_name)
+                        or any(
+                            parameter_map.get(section)
+                            != scenario_parameter_map.get(section)
+                            for section in facade_adapter.get_parameter_map_sections(
+                                process_name
+                            )
+                        )
+                    )
+                    if not is_affected and process_name in base_processes:
+                        adapted_processes[process_name] = base_processes[process_name]
+                        continue
+                    adapted_process = cls._adapt_process(
+                        process_name=process_name,
+                        # assign creates new frame, shared scalars stay untouched
+                        scalars=(
+                            scalars.assign(**scalar_overrides)
+                            if scalar_overrides
+                            else scalars
+                        ),
+                        timeseries=timeseries,
+                        struct=structure_processes[process_name],
+                        facade_adapter=facade_adapter,
+                        parameter_map=scenario_parameter_map,
+                        bus_map=bus_map,
+                    )
+                    if not is_affected:
+                        base_processes[process_name] = adapted_process
+                    adapted_processes[process_name] = adapted_process
+                datapackages[scenario_name] = cls._from_adapted_processes(
+                    adapted_processes, adapter, scenario.location_to_save_to
+                )
+        return datapackages
+
+    @classmethod
+    def _adapt_process(
+        cls,
+        process_name: str,
+        scalars: pd.DataFrame,
+        timeseries: pd.DataFrame,
+        struct: dict,
+        facade_adapter: Type[FacadeAdapter],
+        parameter_map: dict,
+        bus_map: dict,
+    ) -> AdaptedProcess:
+        """Adapts scalars and timeseries of one process to facade element"""
+        # Column lookup is shared by all components of the process
+        timeseries_columns = TimeseriesColumns.from_timeseries(timeseries)
+        component_adapter: Optional[FacadeAdapter] = None
+        components = []
+        process_busses = []
+        process_scalars = cls.yearly_scalars_to_periodic_values(scalars)
+        process_scalars = facade_adapter.batch_pre_mapping_calculations(
+            process_name, process_scalars, parameter_map
+        )
+        process_scalars = facade_adapter.capacity_cost_calculations(
+            process_name, process_scalars, parameter_map
+        )
+        # Build class from adapter with Mapper and add up for each component within the Element
+        for component_data in process_scalars.to_dict(orient="records"):
+            component_adapter: FacadeAdapter = facade_adapter(
+                process_name=process_name,
+                data=component_data,
+                timeseries=timeseries_columns,
+                structure=struct,
+                parameter_map=parameter_map,
+                bus_map=bus_map,
+                batch_calculations=True,
+            )
+            components.append(component_adapter.facade_dict)
+            # Fill with all buses occurring, needed for foreign keys as well!
+            process_busses += list(component_adapter.get_busses().values())
+
+        # getting foreign keys with last component
+        # foreign keys have to be equal for every component within a Process
+        # as foreign key columns cannot have mixed meaning.
+        # thus reading foreign keys only from last facade adapter is sufficient.
+        foreign_keys = cls.get_foreign_keys(component_adapter, components)
+
+        return AdaptedProcess(
+            element=facade_adapter.batch_post_mapping_calculations(
+                process_name, pd.DataFrame(components)
+            ),
+            busses=list(np.unique(process_busses)),
+            foreign_keys=foreign_keys,
+            sequence=None if timeseries.empty else timeseries,
+        )
+
+    @classmethod
+    def _from_adapted_processes(
+        cls,
+        adapted_processes: dict,
+        adapter: Adapter,
+        location_to_save_to: Optional[str] = None,
+    ):
+        """Creates datapackage (including bus element) from adapted processes"""
+        busses = [
+            bus
+            for adapted_process in adapted_processes.values()
+            for bus in adapted_process.busses
+        ]
+        parametrized_elements = {
+            # Create Bus Element from all unique `busses` found in elements
+            "bus": pd.DataFrame(
+                {
+                    "name": (names := np.unique(busses)),
+                    "type": ["bus" for i in names],
+                    "balanced": [True for i in names],
+                }
+            )
+        }
+        parametrized_elements.update(
             {
-                "name": (names := np.unique(parametrized_elements["bus"])),
-                "type": ["bus" for i in names],
-                "balanced": [True for i in names],
+                process_name: adapted_process.element
+                for process_name, adapted_process in adapted_processes.items()
             }
         )
-        periods = cls.get_periods_from_parametrized_sequences(parametrized_sequences)
+        datapackage = cls(
+            parametrized_elements=parametrized_elements,
+            parametrized_sequences={
+                process_name: adapted_process.sequence
+                for process_name, adapted_process in adapted_processes.items()
+                if adapted_process.sequence is not None
+            },
+            adapter=adapter,
+            foreign_keys={
+                process_name: adapted_process.foreign_keys
+                for process_name, adapted_process in adapted_processes.items()
+            },
+            periods=pd.DataFrame(),
+            location_to_save_to=location_to_save_to,
+        )
+        datapackage.update_periods()
+        return datapackage
+
+    @classmethod
+    def from_directory(
+        cls,
+        location: str,
+        datapackage_name: str = "datapackage.json",
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Loads a saved datapackage (see `save_datapackage_to_csv`).
+
+        Elements, sequences, periods and tsam parameters are read in parallel
+        threads. Sequences are read with typed float columns (using pyarrow csv
+        engine if available) and periodic values in elements are parsed to numpy
+        arrays again. Foreign keys are taken from the datapackage descriptor.
+        The loaded datapackage has no adapter.
+
+        Parameters
+        ----------
+        location: str
+            Directory holding the datapackage
+        datapackage_name: str
+            Name of the descriptor file
+        max_workers: int
+            Number of threads reading resources, defaults to
+            `concurrent.futures.ThreadPoolExecutor` default
+
+        Returns
+        -------
+        DataPackage
+
+        """
+        with open(os.path.join(location, datapackage_name), encoding="utf-8") as f:
+            descriptor = json.load(f)
+        resources = descriptor["resources"]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            loaded = list(
+                pool.map(lambda resource: _read_resource(location, resource), resources)
+            )
+
+        parametrized_elements = {}
+        parametrized_sequences = {}
+        foreign_keys = {}
+        periods = pd.DataFrame()
+        tsa_parameters = None
+        for resource, (kind, data) in zip(resources, loaded):
+            if kind == "sequences":
+                # Empty sequences are not part of built datapackages either
+                if not data.columns.empty:
+                    process_name = resource["name"].removesuffix("_sequence")
+                    parametrized_sequences[process_name] = data
+            elif kind == "periods":
+                periods = data
+            elif kind == "tsam":
+                tsa_parameters = data
+            else:
+                parametrized_elements[resource["name"]] = data
+                if resource_foreign_keys := resource["schema"].get("foreignKeys"):
+                    foreign_keys[resource["name"]] = resource_foreign_keys
 
         return cls(
             parametrized_elements=parametrized_elements,
             parametrized_sequences=parametrized_sequences,
-            adapter=adapter,
+            adapter=None,
             foreign_keys=foreign_keys,
             periods=periods,
-            location_to_save_to=location_to_save_to,
+            location_to_save_to=location,
+            tsa_parameters=tsa_parameters,
         )
@@ -0,0 +1,234 @@
+import collections
+import hashlib
+import json
+import os
+import pathlib
+import warnings
+from typing import Optional
+
+import pandas as pd
+from data_adapter.preprocessing import Adapter
+
+from data_adapter_oemof.settings import COLLECTIONS_DIR
+
+CachedProcess = collections.namedtuple(
+    typename="CachedProcess", field_names=["scalars", "timeseries"]
+)
+
+
+class ProcessCache:
+    """
+    Local cache of process data read from a collection
+
+    Scalars and timeseries of every process are stored as parquet files, so that
+    repeated builds of the same collection skip parsing the collection csv files.
+    Cached data is stored in a subdirectory of `cache_dir` named by a key derived
+    from the paths, modification times and sizes of all collection files
+    (and the structure file, if known) and the configuration of the adapter
+    (structure sheets, parsed processes and parameters, links). Changing any of
+    them invalidates the cache.
+
+    Labels of MultiIndex columns wrapped in single-element tuples or lists (as
+    returned by data_adapter) are unwrapped before caching, as parquet stores
+    them as plain labels. Processes are returned with unwrapped labels whether
+    read from cache or not.
+    Data is only cached if it survives the parquet round trip unchanged
+    (i.e. list cells do not), otherwise the process is marked as uncacheable
+    and read from the collection on every build without trying to cache it
+    again.
+
+    Needs `pyarrow` (or `fastparquet`) to be installed.
+    """
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        cache_dir: str,
+        collection_dir: Optional[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        adapter: Adapter
+            Adapter from data_adapter used to read processes missing in cache
+        cache_dir: str
+            Directory to store cached process data in
+        collection_dir: str
+            Directory of the collection, defaults to collection of the adapter
+            in `COLLECTIONS_DIR`
+        """
+        # Raises ImportError if no parquet engine is installed
+        pd.io.parquet.get_engine("auto")
+        self.adapter = adapter
+        if collection_dir is None:
+            if not hasattr(adapter, "collection_name"):
+                raise ValueError(
+                    "Could not derive collection directory from adapter. "
+                    "Please state collection_dir."
+                )
+            collection_dir = COLLECTIONS_DIR / adapter.collection_name
+        self.collection_dir = pathlib.Path(collection_dir)
+        self.cache_dir = pathlib.Path(cache_dir) / self.get_collection_key()
+
+    def get_collection_key(self) -> str:
+        """
+        Hashes paths, modification times and sizes of all files in collection
+        and the adapter configuration (see `get_adapter_configuration`)
+
+        Returns
+        -------
+        Hex digest identifying the current state of the collection
+        """
+        paths = [
+            pathlib.Path(directory, file_name)
+            for directory, _, file_names in os.walk(self.collection_dir)
+            for file_name in file_names
+        ]
+        structure_file = getattr(
+            getattr(self.adapter, "structure", None), "structure_file", None
+        )
+        if isinstance(structure_file, (str, os.PathLike)) and os.path.exists(
+            structure_file
+        ):
+            paths.append(pathlib.Path(structure_file))
+
+        key = hashlib.sha256(str(self.collection_dir.resolve()).encode())
+        key.update(self.get_adapter_configuration().encode())
+        for path in sorted(paths):
+            stat = path.stat()
+            key.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return key.hexdigest()[:16]
+
+    def get_adapter_configuration(self) -> str:
+        """
+        Serializes configuration of adapter and structure affecting process data
+
+        Attributes not found (or not holding plain data) are skipped.
+
+        Returns
+        -------
+        JSON string of structure sheets, processes, parameters and links
+        """
+        structure = getattr(self.adapter, "structure", None)
+        configuration = {
+            name: getattr(structure, name, None)
+            for name in (
+                "process_sheet",
+                "parameter_sheet",
+                "helper_sheet",
+                "processes",
+                "parameters",
+            )
+        }
+        configuration["links"] = getattr(self.adapter, "links", None)
+        configuration = {
+            name: value
+            for name, value in configuration.items()
+            if isinstance(value, (str, int, float, list, tuple, dict, pd.DataFrame))
+        }
+        return json.dumps(
+            configuration,
+            sort_keys=True,
+            default=lambda value: (
+                value.to_json() if isinstance(value, pd.DataFrame) else str(value)
+            ),
+        )
+
+    def _paths(self, process_name: str) -> tuple:
+        return (
+            self.cache_dir / f"{process_name}_scalars.parquet",
+            self.cache_dir / f"{process_name}_timeseries.parquet",
+        )
+
+    def _uncacheable_path(self, process_name: str) -> pathlib.Path:
+        return self.cache_dir / f"{process_name}.uncacheable"
+
+    def get_process(self, process_name: str):
+        """
+        Returns process data from cache, reads and caches it if not found
+
+        Parameters
+        ----------
+        process_name: str
+
+        Returns
+        -------
+        Process data with `scalars` and `timeseries`
+        """
+        scalars_path, timeseries_path = self._paths(process_name)
+        if scalars_path.exists() and timeseries_path.exists():
+            return CachedProcess(
+                scalars=pd.read_parquet(scalars_path),
+                timeseries=pd.read_parquet(timeseries_path),
+            )
+
+        process_data = self.adapter.get_process(process_name)
+        process_data = CachedProcess(
+            scalars=_unwrap_labels(process_data.scalars),
+            timeseries=_unwrap_labels(process_data.timeseries),
+        )
+        uncacheable_path = self._uncacheable_path(process_name)
+        if uncacheable_path.exists():
+            return process_data
+        try:
+            self._write(process_data.scalars, scalars_path)
+            self._write(process_data.timeseries, timeseries_path)
+        except Exception as e:  # pylint: disable=broad-except
+            # Not all data can be stored (losslessly) as parquet
+            # (i.e. nested lists in columns)
+            for path in (scalars_path, timeseries_path):
+                path.unlink(missing_ok=True)
+            uncacheable_path.touch()
+            warnings.warn(f"Could not cache process `{process_name}`: {e}")
+        return process_data
+
+    def _write(self, dataframe: pd.DataFrame, path: pathlib.Path):
+        """
+        Writes to temporary file first to never leave incomplete files in cache
+
+        Raises ValueError if data read back from file differs from given data.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(".tmp")
+        dataframe.to_parquet(temporary_path)
+        if not _is_equal(pd.read_parquet(temporary_path), dataframe):
+            temporary_path.unlink()
+            raise ValueError("Data changes in parquet round trip")
+        os.replace(temporary_path, path)
+
+
+def _unwrap_labels(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Unwraps MultiIndex column labels wrapped in single-element tuples or lists"""
+    columns = dataframe.columns
+    if not isinstance(columns, pd.MultiIndex) or not any(
+        isinstance(value, (list, tuple)) for level in columns.levels for value in level
+    ):
+        return dataframe
+    columns = pd.MultiIndex.from_arrays(
+        [
+            columns.get_level_values(level).map(
+                lambda value: (
+                    value[0]
+                    if isinstance(value, (list, tuple)) and len(value) == 1
+                    else value
+                )
+            )
+            for level in range(columns.nlevels)
+        ],
+        names=columns.names,
+    )
+    return dataframe.set_axis(columns, axis=1, copy=False)
+
+
+def _is_equal(read: pd.DataFrame, written: pd.DataFrame) -> bool:
+    """Checks data, dtypes and (MultiIndex) labels of read and written frame"""
+    try:
+        return (
+            read.columns.equals(written.columns)
+            and read.columns.names == written.columns.names
+            and read.index.equals(written.index)
+            and read.equals(written)
+        )
+    except (TypeError, ValueError):
+        # Comparison of list and array cells
+        return False
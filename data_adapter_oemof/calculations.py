@@ -1,12 +1,18 @@
 import collections
 import logging
 import warnings
+from typing import Optional
 
 import numpy as np
 import pandas as pd
-from oemof.tools.economics import annuity
 
-from .utils import divide_two_lists, multiply_two_lists
+from .utils import (
+    array_to_periodic_values,
+    divide_two_lists,
+    is_periodic,
+    multiply_two_lists,
+    periodic_values_to_array,
+)
 
 
 class CalculationError(Exception):
@@ -39,11 +45,115 @@ def get_name(*args, counter=None):
     return name
 
 
+def annuity(capex, n, wacc):
+    """
+    Vectorized annuity of capex over n years with given wacc.
+
+    Same as `oemof.tools.economics.annuity` (without replacements) but works on
+    scalars and arrays alike. For a wacc of 0 capex is spread evenly over n years.
+
+    Raises
+    ------
+    ValueError if any n is below 1 or any wacc is outside of [0, 1]
+    (including NaN values)
+    """
+    capex, n, wacc = np.broadcast_arrays(
+        np.asarray(capex, dtype=float),
+        np.asarray(n, dtype=float),
+        np.asarray(wacc, dtype=float),
+    )
+    # Negated checks to catch NaN values as well
+    if not ((n >= 1) & (wacc >= 0) & (wacc <= 1)).all():
+        raise ValueError("Input arguments for 'annuity' out of bounds!")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (1 + wacc) ** n
+        return np.where(wacc == 0, capex / n, capex * wacc * factor / (factor - 1))
+
+
 @calculation
 def get_capacity_cost(overnight_cost, fixed_cost, lifetime, wacc):
     return annuity(overnight_cost, lifetime, wacc) + fixed_cost
 
 
+def capacity_cost_frame(
+    scalars: pd.DataFrame,
+    capacity_cost_column: str,
+    overnight_cost_column: str,
+    fixed_cost_column: str,
+    lifetime_column: str,
+    wacc_column: str,
+    process_name: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Calculates capacity costs for all components and periods of a process at once.
+
+    Capacity costs are the annuity of overnight costs over lifetime with given wacc
+    plus fixed costs (see `get_capacity_cost`). Missing fixed costs count as 0.
+    Capacity costs are only calculated if they are not given in the data and
+    overnight costs, lifetime and wacc are found. Note that none of the latter
+    is mapped in the default parameter map, thus capacity costs are only
+    calculated if `overnight_cost`, `lifetime` and `wacc` are mapped.
+
+    Values with lifetime below 1 or wacc outside of [0, 1] (including missing
+    values) are left NaN, a single warning names the affected rows.
+
+    Parameters
+    ----------
+    scalars
+        Periodic scalars of a process (before mapping)
+    capacity_cost_column
+        Name of the column capacity costs are written to
+    overnight_cost_column, fixed_cost_column, lifetime_column, wacc_column
+        Names of the columns holding the input data
+    process_name
+        Name of process, used in warning only
+
+    Returns
+    -------
+    scalars with capacity cost column
+
+    """
+    if capacity_cost_column in scalars.columns:
+        return scalars
+    input_columns = (overnight_cost_column, lifetime_column, wacc_column)
+    if not all(column in scalars.columns for column in input_columns):
+        return scalars
+
+    overnight_cost, lifetime, wacc = (
+        periodic_values_to_array(scalars[column]) for column in input_columns
+    )
+    periodic = np.logical_or.reduce(
+        [_periodic_rows(scalars[column]) for column in input_columns]
+    )
+    if fixed_cost_column in scalars.columns:
+        fixed_cost = np.nan_to_num(periodic_values_to_array(scalars[fixed_cost_column]))
+        periodic |= _periodic_rows(scalars[fixed_cost_column])
+    else:
+        fixed_cost = 0
+
+    overnight_cost, fixed_cost, lifetime, wacc = np.broadcast_arrays(
+        overnight_cost, fixed_cost, lifetime, wacc
+    )
+    # Negated checks to catch NaN values as well
+    valid = (lifetime >= 1) & (wacc >= 0) & (wacc <= 1)
+    capacity_cost = np.full(valid.shape, np.nan)
+    if valid.any():
+        capacity_cost[valid] = get_capacity_cost(
+            overnight_cost[valid], fixed_cost[valid], lifetime[valid], wacc[valid]
+        )
+    if not valid.all():
+        logging.warning(
+            "Could not calculate capacity costs of process `%s` in rows %s, "
+            "as lifetime is below 1 or wacc is outside of [0, 1] (or missing).",
+            process_name,
+            scalars.index[~valid.all(axis=1)].tolist(),
+            extra={"process_name": process_name},
+        )
+    scalars = scalars.copy()
+    scalars[capacity_cost_column] = array_to_periodic_values(capacity_cost, periodic)
+    return scalars
+
+
 def decommission(process_name, adapter_dict: dict) -> dict:
     """
 
@@ -80,14 +190,17 @@ def decommission(process_name, adapter_dict: dict) -> dict:
     # check if capacity column is there and if it has to be decommissioned
     if capacity_column not in adapter_dict.keys():
         logging.info(
-            f"Capacity missing for decommissioning " f"of Process `{process_name}`"
+            "Capacity missing for decommissioning of Process `%s`",
+            process_name,
+            extra={"process_name": process_name},
         )
         return adapter_dict
 
-    if not isinstance(adapter_dict[capacity_column], list):
+    if not is_periodic(adapter_dict[capacity_column]):
         logging.info(
-            f"No capacity fading out that can be decommissioned"
-            f" for Process `{process_name}`."
+            "No capacity fading out that can be decommissioned for Process `%s`.",
+            process_name,
+            extra={"process_name": process_name},
         )
         return adapter_dict
 
@@ -158,6 +271,170 @@ def floor_lifetime(mapped_defaults):
     return mapped_defaults
 
 
+def _periodic_rows(column: pd.Series) -> np.ndarray:
+    """Returns boolean mask of rows holding periodic values"""
+    return np.fromiter(
+        (isinstance(entry, (list, np.ndarray)) for entry in column.to_numpy()),
+        dtype=bool,
+        count=len(column),
+    )
+
+
+def decommission_frame(process_name, elements: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch version of `decommission` for all components of a process.
+
+    Takes the element frame of a process with mapped values.
+    For every row with periodic capacity the largest capacity is set as capacity
+    and the max value in `output_parameters` is rescaled accordingly:
+
+    .. math::
+        max_{new} = \frac{(max_{column} * capacity_{column})}{capacity_{max}}
+
+    Rows without periodic capacity are kept as they are.
+
+    Returns
+    element frame with max values in output parameters and a single capacity
+    -------
+
+    """
+    capacity_column = "capacity"
+    max_column = "max"
+
+    if capacity_column not in elements.columns:
+        logging.info(
+            "Capacity missing for decommissioning of Process `%s`",
+            process_name,
+            extra={"process_name": process_name},
+        )
+        return elements
+
+    periodic = _periodic_rows(elements[capacity_column])
+    if not periodic.any():
+        logging.info(
+            "No capacity fading out that can be decommissioned for Process `%s`.",
+            process_name,
+            extra={"process_name": process_name},
+        )
+        return elements
+
+    rows = np.flatnonzero(periodic)
+    capacities = periodic_values_to_array(elements[capacity_column].iloc[rows])
+    max_capacities = capacities.max(axis=1)
+
+    if "output_parameters" in elements.columns:
+        output_parameters = [
+            parameters if isinstance(parameters, dict) else {}
+            for parameters in elements["output_parameters"].iloc[rows]
+        ]
+    else:
+        output_parameters = [{} for _ in rows]
+
+    # I: Without max value the max value is capacity / max capacity
+    # II: Existing max value is scaled by capacity / max capacity
+    max_values = np.ones_like(capacities)
+    for i, parameters in enumerate(output_parameters):
+        if max_column in parameters:
+            max_values[i] = parameters[max_column]
+    max_values = max_values * capacities / max_capacities[:, np.newaxis]
+
+    elements = elements.copy()
+    new_output_parameters = (
+        elements["output_parameters"].to_numpy(dtype=object, copy=True)
+        if "output_parameters" in elements.columns
+        else np.full(len(elements), np.nan, dtype=object)
+    )
+    new_capacities = elements[capacity_column].to_numpy(dtype=object, copy=True)
+    for row, parameters, max_value, max_capacity in zip(
+        rows, output_parameters, max_values, max_capacities
+    ):
+        new_output_parameters[row] = {**parameters, max_column: max_value}
+        new_capacities[row] = max_capacity
+    elements["output_parameters"] = new_output_parameters
+    elements[capacity_column] = pd.Series(
+        new_capacities, index=elements.index
+    ).infer_objects()
+    return elements
+
+
+def normalize_activity_bonds_frame(
+    scalars: pd.DataFrame, capacity_column: str
+) -> pd.DataFrame:
+    """
+    Batch version of `normalize_activity_bonds` for all components of a process.
+
+    Divides the first found activity bond column by the capacity column,
+    returns 0 where capacity is 0.
+
+    Parameters
+    ----------
+    scalars
+        Periodic scalars of a process (before mapping)
+    capacity_column
+        Name of the (mapped) capacity column
+
+    Returns
+    -------
+
+    """
+    for bond_column in (
+        "activity_bound_fix",
+        "activity_bound_min",
+        "activity_bound_max",
+    ):
+        if bond_column not in scalars.columns:
+            continue
+        bonds = scalars[bond_column]
+        capacities = (
+            scalars[capacity_column]
+            if capacity_column in scalars.columns
+            else pd.Series(np.nan, index=scalars.index)
+        )
+        normalized = divide_two_lists(
+            periodic_values_to_array(bonds), periodic_values_to_array(capacities)
+        )
+        # Rows with scalar bond and capacity stay scalar
+        periodic = _periodic_rows(bonds) | _periodic_rows(capacities)
+        scalars = scalars.copy()
+        scalars[bond_column] = array_to_periodic_values(normalized, periodic)
+        return scalars
+    return scalars
+
+
+def floor_lifetime_frame(elements: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch version of `floor_lifetime` for all components of a process.
+
+    Lifetime cannot change in multi-period modeling, thus the first period's
+    lifetime is used and rounded down to integers. A warning is issued if
+    lifetime changes over periods for any component.
+    Missing lifetimes stay missing.
+
+    Parameters
+    ----------
+    elements
+
+    Returns
+    -------
+
+    """
+    if "lifetime" not in elements.columns:
+        return elements
+    lifetimes = periodic_values_to_array(elements["lifetime"])
+    missing = np.isnan(lifetimes).all(axis=1)
+    constant = (lifetimes == lifetimes[:, :1]).all(axis=1)
+    if not (constant | missing).all():
+        warnings.warn("Lifetime cannot change in Multi-period modeling")
+
+    floored = np.floor(lifetimes[:, 0])
+    elements = elements.copy()
+    if np.isnan(floored).any():
+        elements["lifetime"] = pd.array(floored, dtype="Int64")
+    else:
+        elements["lifetime"] = floored.astype(int)
+    return elements
+
+
 def handle_nans(group_df: pd.DataFrame) -> pd.DataFrame:
     """
     This function shall handle found nans in the data.
@@ -0,0 +1,247 @@
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+from typing import Optional
+
+# Supported output formats and related compression of sequences
+OUTPUT_FORMATS = {"csv": None, "csv.gz": "gzip", "csv.zst": "zstd"}
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Creates parser of command line interface `data-adapter-oemof`
+
+    Returns
+    -------
+    argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="data-adapter-oemof",
+        description="Create oemof.tabular datapackages from SEDOS collections",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser(
+        "build", help="Build datapackage from collection and structure"
+    )
+    build.add_argument(
+        "collection", help="Name of collection (in collections directory)"
+    )
+    build.add_argument(
+        "-o", "--output", required=True, help="Directory to save datapackage to"
+    )
+
+    structure = build.add_argument_group("structure")
+    structure.add_argument(
+        "--structure",
+        required=True,
+        help="Name of structure workbook (in structures directory)",
+    )
+    structure.add_argument("--process-sheet", default="Processes_O1")
+    structure.add_argument("--parameter-sheet", default="Parameter_Input-Output")
+    structure.add_argument("--helper-sheet", default=None)
+
+    mappings = build.add_argument_group("mappings")
+    mappings.add_argument(
+        "--process-adapter-map",
+        metavar="YAML",
+        help="Process adapter map, defaults to adapters given in structure "
+        "workbook (column 'facade adapter (oemof)') or default mapping",
+    )
+    mappings.add_argument(
+        "--parameter-map", metavar="YAML", help="Parameter map, defaults to default"
+    )
+    mappings.add_argument(
+        "--bus-map", metavar="YAML", help="Bus map, defaults to default mapping"
+    )
+
+    selection = build.add_argument_group("selection")
+    selection.add_argument(
+        "--processes", nargs="+", metavar="PATTERN", help="Glob patterns of processes"
+    )
+    selection.add_argument("--regions", nargs="+", metavar="REGION")
+    selection.add_argument("--years", nargs="+", type=int, metavar="YEAR")
+
+    performance = build.add_argument_group("performance")
+    performance.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        help="Number of processes read ahead from the collection while the "
+        "current process is adapted (0 reads synchronously)",
+    )
+    performance.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of threads used to compress sequences "
+        "(default based on number of CPUs)",
+    )
+    performance.add_argument(
+        "--cache-dir", help="Directory to cache process data in (needs pyarrow)"
+    )
+    performance.add_argument(
+        "--format",
+        choices=list(OUTPUT_FORMATS),
+        default="csv",
+        help="Output format of sequences",
+    )
+    performance.add_argument(
+        "--split-by-year",
+        action="store_true",
+        help="Save one sequence resource per process and year",
+    )
+    performance.add_argument(
+        "--chunksize",
+        type=int,
+        default=100_000,
+        help="Number of rows of sequences written at once",
+    )
+    performance.add_argument(
+        "--tsam-config",
+        metavar="JSON",
+        help="Aggregate timeseries using tsam configuration (one per period)",
+    )
+    performance.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate foreign keys before saving",
+    )
+    performance.add_argument(
+        "--progress",
+        action="store_true",
+        help="Print progress and throughput of build and save to stderr",
+    )
+    performance.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Profile build and save profiling stats to FILE "
+        "(a summary is printed to stderr)",
+    )
+    build.set_defaults(func=build_command)
+    return parser
+
+
+def print_progress(progress) -> None:
+    """
+    Prints progress of build, save or timeseries aggregation to stderr
+
+    Parameters
+    ----------
+    progress: Progress
+        Progress as reported by `DataPackage` methods
+    """
+    print(
+        f"\r{progress.stage}: {progress.done}/{progress.total} "
+        f"(avg. {progress.average_rows_per_second:,.0f} rows/s, "
+        f"{progress.average_bytes_per_second / 1e6:,.1f} MB/s) {progress.name}\033[K",
+        end="\n" if progress.done == progress.total else "",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def build_command(args: argparse.Namespace) -> None:
+    """
+    Builds and saves datapackage as given by command line arguments
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        Parsed arguments of `build` command
+    """
+    # Imported here, as settings need existing collections and structures
+    # directories, which are not needed to show help
+    from data_adapter.preprocessing import Adapter
+    from data_adapter.structure import Structure
+
+    from data_adapter_oemof.build_datapackage import DataPackage
+    from data_adapter_oemof.settings import BUS_MAP, PARAMETER_MAP, PROCESS_ADAPTER_MAP
+    from data_adapter_oemof.structure_mapping import (
+        FACADE_ADAPTER_COLUMN,
+        get_process_adapter_map,
+    )
+    from data_adapter_oemof.utils import load_yaml
+
+    structure = Structure(
+        args.structure,
+        process_sheet=args.process_sheet,
+        parameter_sheet=args.parameter_sheet,
+        helper_sheet=args.helper_sheet,
+    )
+    adapter = Adapter(args.collection, structure=structure)
+
+    if args.process_adapter_map:
+        process_adapter_map = load_yaml(args.process_adapter_map)
+    else:
+        process_adapter_map = get_process_adapter_map(
+            structure.structure_file,
+            process_sheet=args.process_sheet,
+            helper_sheet=args.helper_sheet,
+        )
+        if not process_adapter_map:
+            print(
+                f"No column '{FACADE_ADAPTER_COLUMN}' found in structure, "
+                "using default process adapter map.",
+                file=sys.stderr,
+            )
+            process_adapter_map = PROCESS_ADAPTER_MAP
+
+    datapackage = DataPackage.build_datapackage(
+        adapter=adapter,
+        process_adapter_map=process_adapter_map,
+        parameter_map=(
+            load_yaml(args.parameter_map) if args.parameter_map else PARAMETER_MAP
+        ),
+        bus_map=load_yaml(args.bus_map) if args.bus_map else BUS_MAP,
+        location_to_save_to=args.output,
+        prefetch=args.prefetch,
+        cache_dir=args.cache_dir,
+        processes=args.processes,
+        regions=args.regions,
+        years=args.years,
+        progress=print_progress if args.progress else None,
+    )
+
+    save_options = {
+        "chunksize": args.chunksize,
+        "compression": OUTPUT_FORMATS[args.format],
+        "max_workers": args.workers,
+        "split_sequences_by_year": args.split_by_year,
+        "validate": args.validate,
+        "progress": print_progress if args.progress else None,
+    }
+    if args.tsam_config:
+        with open(args.tsam_config, encoding="utf-8") as f:
+            tsam_config = json.load(f)
+        datapackage.time_series_aggregation(
+            tsam_config=tsam_config, location_to_save_to=args.output, **save_options
+        )
+    else:
+        datapackage.save_datapackage_to_csv(args.output, **save_options)
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Entry point of command line interface `data-adapter-oemof`
+
+    Parameters
+    ----------
+    argv: list
+        Command line arguments, defaults to `sys.argv[1:]`
+    """
+    args = get_parser().parse_args(argv)
+    if not getattr(args, "profile", None):
+        args.func(args)
+        return
+
+    profile = cProfile.Profile()
+    profile.runcall(args.func, args)
+    profile.dump_stats(args.profile)
+    pstats.Stats(profile, stream=sys.stderr).sort_stats("cumulative").print_stats(30)
+
+
+if __name__ == "__main__":
+    main()
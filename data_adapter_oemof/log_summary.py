@@ -0,0 +1,135 @@
+import collections
+import contextlib
+import logging
+import warnings
+from typing import Iterator, Optional
+
+logger = logging.getLogger()
+
+
+class LogSummary(logging.Filter):
+    """
+    Rate-limits and counts log records and warnings of a build
+
+    Records are grouped by level, unformatted message (`record.msg`, which is the
+    message template if arguments are passed lazily) and process (`process_name`
+    passed via `extra`). Only the first `limit` records of every group are
+    passed on, further records are counted only.
+    Warnings are grouped by category and message.
+
+    Note that records below the effective level of the logger are neither
+    created nor counted.
+    """
+
+    def __init__(self, limit: Optional[int] = 3):
+        """
+        Parameters
+        ----------
+        limit: int
+            Number of records passed per message and process,
+            None passes all records (counting only)
+        """
+        super().__init__()
+        self.limit = limit
+        self.counts = collections.Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (
+            record.levelname,
+            str(record.msg),
+            getattr(record, "process_name", None),
+        )
+        self.counts[key] += 1
+        return self.limit is None or self.counts[key] <= self.limit
+
+    def add_warnings(self, caught_warnings: list) -> None:
+        """
+        Counts caught warnings
+
+        Parameters
+        ----------
+        caught_warnings: list
+            Warnings as recorded by `warnings.catch_warnings(record=True)`
+        """
+        for warning in caught_warnings:
+            self.counts[(warning.category.__name__, str(warning.message), None)] += 1
+
+    def get_summary(self) -> str:
+        """
+        Summarizes counted records, one line per level and message
+
+        Returns
+        -------
+        Summary with number of records per message and process,
+        empty if nothing was counted
+        """
+        messages = collections.defaultdict(collections.Counter)
+        for (level, message, process_name), count in self.counts.items():
+            messages[(level, message)][process_name] += count
+        lines = []
+        for (level, message), processes in sorted(
+            messages.items(), key=lambda item: -sum(item[1].values())
+        ):
+            line = f"{level} {sum(processes.values())}x: {message}"
+            process_counts = ", ".join(
+                f"{process_name}: {count}"
+                for process_name, count in processes.most_common()
+                if process_name is not None
+            )
+            if process_counts:
+                line += f" ({process_counts})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def summarize_logs(
+    name: str = "build", limit: Optional[int] = 3
+) -> Iterator[LogSummary]:
+    """
+    Rate-limits log records and warnings within context and logs a summary at exit
+
+    Log records of the root logger (used by adapters and calculations) are
+    passed and counted by `LogSummary`. Warnings are caught, counted and
+    reissued once per message at exit. The summary is logged as a single
+    record (warning level if warnings occurred, info level otherwise).
+    Warnings and summary are emitted even if an exception is raised within
+    context.
+
+    Parameters
+    ----------
+    name: str
+        Name of summarized task, used in summary header
+    limit: int
+        Number of records passed per message and process, see `LogSummary`
+
+    Yields
+    ------
+    LogSummary
+    """
+    summary = LogSummary(limit=limit)
+    logger.addFilter(summary)
+    caught_warnings = []
+    try:
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter("always")
+            yield summary
+    finally:
+        logger.removeFilter(summary)
+
+        summary.add_warnings(caught_warnings)
+        for category, message in dict.fromkeys(
+            (warning.category, str(warning.message)) for warning in caught_warnings
+        ):
+            warnings.warn(message, category)
+
+        if summary.counts:
+            level = (
+                logging.WARNING
+                if any(
+                    level not in ("DEBUG", "INFO")
+                    for level, _, _ in summary.counts.keys()
+                )
+                else logging.INFO
+            )
+            logger.log(level, "Log summary of %s:\n%s", name, summary.get_summary())
@@ -0,0 +1,99 @@
+import dataclasses
+import time
+from typing import Callable, Optional
+
+
+@dataclasses.dataclass(frozen=True)
+class Progress:
+    """
+    Progress of a build, save or timeseries aggregation
+
+    Attributes
+    ----------
+    stage: str
+        "build", "save" or "tsam"
+    name: str
+        Name of the process, resource or period just finished
+    done: int
+        Number of finished processes, resources or periods
+    total: int
+        Total number of processes, resources or periods
+    rows: int
+        Number of rows processed so far
+    bytes: int
+        Number of bytes processed (build, tsam) or written (save) so far
+    elapsed: float
+        Seconds since start of stage
+    """
+
+    stage: str
+    name: str
+    done: int
+    total: int
+    rows: int
+    bytes: int
+    elapsed: float
+
+    @property
+    def average_rows_per_second(self) -> float:
+        """Rows per second averaged since start of stage"""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def average_bytes_per_second(self) -> float:
+        """Bytes per second averaged since start of stage"""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProgressReporter:
+    """
+    Counts progress of a stage and reports it to a callback
+
+    Does nothing if no callback is given. Callers should only determine costly
+    row or byte counts if the reporter is `active`.
+    """
+
+    def __init__(
+        self, callback: Optional[Callable[[Progress], None]], stage: str, total: int
+    ):
+        self.callback = callback
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.rows = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+    @property
+    def active(self) -> bool:
+        return self.callback is not None
+
+    def update(self, name: str, rows: int = 0, nbytes: int = 0) -> None:
+        """
+        Reports one more finished process, resource or period
+
+        Parameters
+        ----------
+        name: str
+            Name of finished process, resource or period
+        rows: int
+            Number of rows processed
+        nbytes: int
+            Number of bytes processed or written
+        """
+        if self.callback is None:
+            return
+        self.done += 1
+        self.rows += rows
+        self.bytes += nbytes
+        self.callback(
+            Progress(
+                stage=self.stage,
+                name=name,
+                done=self.done,
+                total=self.total,
+                rows=self.rows,
+                bytes=self.bytes,
+                elapsed=time.perf_counter() - self.start,
+            )
+        )
@@ -0,0 +1,78 @@
+import functools
+import os
+from typing import Optional
+
+import pandas as pd
+
+from data_adapter_oemof.adapters import FACADE_ADAPTERS, MappingError
+
+FACADE_ADAPTER_COLUMN = "facade adapter (oemof)"
+
+
+def get_process_adapter_map(
+    structure_file: str, process_sheet: str, helper_sheet: Optional[str] = None
+) -> dict:
+    """
+    Derives process adapter map from structure workbook.
+
+    Reads the column "facade adapter (oemof)" from process and helper sheet with a
+    single read of the workbook. Parsed mappings are cached per workbook and
+    sheets and reread only if the workbook has been modified since.
+    Processes without facade adapter are omitted.
+
+    Parameters
+    ----------
+    structure_file: str
+        Path to structure workbook (i.e. `structure.structure_file`)
+    process_sheet: str
+        Name of sheet holding processes
+    helper_sheet: str
+        Name of sheet holding helper processes (optional)
+
+    Returns
+    -------
+    dict mapping process names to facade adapter names
+
+    Raises
+    ------
+    MappingError if an adapter is not found in `FACADE_ADAPTERS`
+    """
+    process_adapter_map = _read_process_adapter_map(
+        str(structure_file),
+        os.path.getmtime(structure_file),
+        process_sheet,
+        helper_sheet,
+    )
+    return dict(process_adapter_map)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_process_adapter_map(
+    structure_file: str,
+    modification_time: float,  # pylint: disable=unused-argument
+    process_sheet: str,
+    helper_sheet: Optional[str],
+) -> tuple:
+    """Reads and validates process adapter map, cached by file modification time"""
+    sheet_names = [process_sheet] + ([helper_sheet] if helper_sheet else [])
+    sheets = pd.read_excel(io=structure_file, sheet_name=sheet_names)
+
+    process_adapter_map = {}
+    for sheet_name in sheet_names:
+        sheet = sheets[sheet_name]
+        if FACADE_ADAPTER_COLUMN not in sheet.columns:
+            continue
+        sheet = sheet[["process", FACADE_ADAPTER_COLUMN]].dropna()
+        process_adapter_map.update(zip(sheet["process"], sheet[FACADE_ADAPTER_COLUMN]))
+
+    unknown_adapters = {
+        process: adapter
+        for process, adapter in process_adapter_map.items()
+        if adapter not in FACADE_ADAPTERS
+    }
+    if unknown_adapters:
+        raise MappingError(
+            f"Unknown facade adapters in '{structure_file}': {unknown_adapters}. "
+            f"Available adapters are: {sorted(FACADE_ADAPTERS)}"
+        )
+    return tuple(process_adapter_map.items())
@@ -9,25 +9,32 @@ def load_yaml(file_path):
     return dictionary
 
 
-def has_mixed_types(column) -> bool:
+def is_periodic(value) -> bool:
     """
-    Function to check if an element is of mixed type
+    Function to check if a value is a periodic value
+
+    Periodic values hold one entry per period and are represented as numpy arrays
+    throughout the adapter and calculation pipeline.
+
     Parameters
     ----------
-    column
+    value
 
     Returns bool
     -------
 
     """
-    unique_types = set(type(element) for element in column)
-    return len(unique_types) > 1
+    return isinstance(value, np.ndarray)
 
 
-def convert_mixed_types_to_same_length(column):
+def convert_mixed_types_to_same_length(column: pd.Series) -> pd.Series:
     """
     Function to convert entries to arrays of the same length
-    only for columns with mixed types
+    only for columns mixing periodic values and scalars
+
+    Only object columns can hold periodic values, all other columns are returned
+    as they are. Scalars are broadcast to period length into object arrays,
+    which keeps the type of every scalar. NaN entries are kept as NaN.
 
     Parameters
     ----------
@@ -37,55 +44,230 @@ def convert_mixed_types_to_same_length(column):
     -------
 
     """
-    if has_mixed_types(column):
-        max_length = max(
-            len(entry) if isinstance(entry, list) else 1 for entry in column
-        )
-        return [
-            (
-                entry
-                if isinstance(entry, list)
-                else (
-                    [entry for x in range(max_length)] if not pd.isna(entry) else np.nan
-                )
-            )  # Keep NaN as is
-            for entry in column
-        ]
-    else:
+    if column.dtype != object:
+        return column
+    entries = column.to_numpy()
+    periodic = np.fromiter(
+        (isinstance(entry, (list, np.ndarray)) for entry in entries),
+        dtype=bool,
+        count=len(entries),
+    )
+    if not periodic.any() or periodic.all():
         return column
 
+    max_length = max(len(entry) for entry in entries[periodic])
+    scalar_positions = np.flatnonzero(~periodic & ~pd.isna(entries))
+
+    converted = np.empty(len(entries), dtype=object)
+    converted[:] = np.nan
+    for position in np.flatnonzero(periodic):
+        converted[position] = np.asarray(entries[position])
+    for position in scalar_positions:
+        converted[position] = np.full(max_length, entries[position], dtype=object)
+    return pd.Series(converted, index=column.index, name=column.name)
+
+
+def periodic_values_to_array(column: pd.Series) -> np.ndarray:
+    """
+    Function to stack a column of periodic values and scalars into one array
+
+    Periodic values become rows of a 2D array with one column per period,
+    scalars are broadcast over all periods. If there is no periodic value in
+    the column, the array has a single period.
+
+    Parameters
+    ----------
+    column
+
+    Returns
+    -------
+    Float array of shape (len(column), number of periods)
+
+    """
+    entries = column.to_numpy(dtype=object)
+    periodic = np.fromiter(
+        (isinstance(entry, (list, np.ndarray)) for entry in entries),
+        dtype=bool,
+        count=len(entries),
+    )
+    periods = max((len(entry) for entry in entries[periodic]), default=1)
+    array = np.empty((len(entries), periods))
+    array[~periodic] = entries[~periodic].astype(float)[:, np.newaxis]
+    if periodic.any():
+        array[periodic] = np.vstack(entries[periodic]).astype(float)
+    return array
+
+
+def array_to_periodic_values(array: np.ndarray, periodic: np.ndarray) -> np.ndarray:
+    """
+    Function to split a 2D array into periodic values and scalars
+
+    Counterpart of `periodic_values_to_array`: rows marked as periodic are kept as
+    periodic values, all other rows are reduced to the value of their first period.
+
+    Parameters
+    ----------
+    array
+        Array of shape (rows, number of periods)
+    periodic
+        Boolean mask of rows to keep periodic
+
+    Returns
+    -------
+    Object array with one entry per row
+
+    """
+    values = np.empty(len(array), dtype=object)
+    for row, is_periodic_row in enumerate(periodic):
+        values[row] = array[row] if is_periodic_row else array[row, 0]
+    return values
+
+
+def periodic_values_to_lists(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Function to serialize periodic values to lists
+
+    Periodic values are kept as numpy arrays while building the datapackage and
+    are only turned into lists (also within dicts like `output_parameters`)
+    when writing.
+
+    Parameters
+    ----------
+    dataframe
+
+    Returns
+    -------
+    Copy of dataframe with lists instead of numpy arrays
+
+    """
+
+    def serialize(value):
+        if is_periodic(value):
+            return value.tolist()
+        if isinstance(value, dict):
+            return {key: serialize(entry) for key, entry in value.items()}
+        return value
+
+    object_columns = dataframe.select_dtypes(include="object").columns
+    if object_columns.empty:
+        return dataframe
+    dataframe = dataframe.copy()
+    for column in object_columns:
+        dataframe[column] = dataframe[column].map(serialize)
+    return dataframe
+
+
+def lists_to_periodic_values(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Function to parse serialized numeric lists back into periodic values
+
+    Counterpart of `periodic_values_to_lists` used when reading elements from csv.
+    Strings like "[2016, 2030, 2050]" or "[nan, 1.5]" become numpy arrays,
+    all other entries are kept as they are.
+
+    Parameters
+    ----------
+    dataframe
+
+    Returns
+    -------
+    Copy of dataframe with numpy arrays instead of numeric list strings
+
+    """
+
+    def parse(value):
+        if not (isinstance(value, str) and value[:1] == "[" and value[-1:] == "]"):
+            return value
+        entries = [entry.strip() for entry in value[1:-1].split(",")]
+        for dtype in (int, float):
+            try:
+                return np.array(entries, dtype=dtype)
+            except ValueError:
+                continue
+        return value
+
+    object_columns = dataframe.select_dtypes(include="object").columns
+    if object_columns.empty:
+        return dataframe
+    dataframe = dataframe.copy()
+    for column in object_columns:
+        dataframe[column] = dataframe[column].map(parse)
+    return dataframe
+
+
+def flatten_timeseries_columns(columns: pd.Index) -> pd.Index:
+    """
+    Function to flatten MultiIndex timeseries columns to "<level0>_<level1>" labels
+
+    Only the first two levels are joined (further levels are ignored). Level
+    values wrapped in single-element lists or tuples are unwrapped. Missing
+    labels (i.e. NaN region) are left out, thus a column without region is
+    labelled by its level-0 name only. Labels are built from the (few) unique
+    level values and the level codes instead of mapping every label. Columns
+    are not modified.
+
+    Parameters
+    ----------
+    columns
+        Columns of timeseries, returned as they are if not a MultiIndex
+
+    Returns
+    -------
+    Flattened column index
+    """
+    if not isinstance(columns, pd.MultiIndex):
+        return columns
+    labels = []
+    for level, level_codes in zip(columns.levels[:2], columns.codes[:2]):
+        values = []
+        for value in level:
+            if isinstance(value, (list, tuple)) and len(value) == 1:
+                value = value[0]
+            values.append("" if pd.isna(value) else str(value))
+        # Code -1 marks missing label, mapped to appended empty label
+        values = np.array(values + [""], dtype=object)
+        labels.append(values[np.where(level_codes == -1, len(level), level_codes)])
+    if len(labels) == 1:
+        return pd.Index(labels[0])
+    first, second = labels
+    separator = np.where((first == "") | (second == ""), "", "_")
+    return pd.Index(first + separator + second)
+
 
 def divide_two_lists(dividend, divisor):
     """
-    Divides two lists returns quotient, returns 0 if divisor is 0
+    Divides two periodic values returns quotient, returns 0 where divisor is 0
 
-    Lists must be same length
+    Values must be same length or scalar
 
     Parameters
     ----------
     dividend
     divisor
 
-    Returns divided list
+    Returns divided array
     -------
 
     """
-    return [i / j if j != 0 else 0 for i, j in zip(dividend, divisor)]
+    dividend = np.asarray(dividend, dtype=float)
+    divisor = np.asarray(divisor, dtype=float)
+    quotient = np.zeros(np.broadcast(dividend, divisor).shape)
+    return np.divide(dividend, divisor, out=quotient, where=divisor != 0)
 
 
 def multiply_two_lists(l1, l2):
     """
-    Multiplies two lists
+    Multiplies two periodic values
 
-    Lists must be same length
+    Values must be same length or scalar
 
     Parameters
     ----------
     l1
     l2
 
-    Returns divided list
+    Returns multiplied array
     -------
 
     """
-    return [i * j for i, j in zip(l1, l2)]
+    return np.multiply(np.asarray(l1), np.asarray(l2))
@@ -1,6 +1,5 @@
 import pathlib
 
-import pandas as pd
 from data_adapter.databus import download_collection  # noqa
 from data_adapter.preprocessing import Adapter  # noqa: E402
 from data_adapter.structure import Structure  # noqa: E402
@@ -16,6 +15,7 @@ from oemof.tabular.facades import Commodity, Conversion, Excess, Load, Volatile
 from oemof_industry.mimo_converter import MIMO
 
 from data_adapter_oemof.build_datapackage import DataPackage  # noqa: E402
+from data_adapter_oemof.structure_mapping import get_process_adapter_map  # noqa: E402
 
 EnergySystem.from_datapackage = classmethod(deserialize_energy_system)
 
@@ -42,22 +42,9 @@ adapter = Adapter(
 )
 
 # create dicitonary with all found in and outputs
-process_adapter_map = pd.concat(
-    [
-        pd.read_excel(
-            io=structure.structure_file,
-            sheet_name="Processes_O1",
-            usecols=("process", "facade adapter (oemof)"),
-            index_col="process",
-        ),
-        pd.read_excel(
-            io=structure.structure_file,
-            sheet_name="Helper_O1",
-            usecols=("process", "facade adapter (oemof)"),
-            index_col="process",
-        ),
-    ]
-).to_dict(orient="dict")["facade adapter (oemof)"]
+process_adapter_map = get_process_adapter_map(
+    structure.structure_file, process_sheet="Processes_O1", helper_sheet="Helper_O1"
+)
 
 
 parameter_map = {
@@ -1,11 +1,16 @@
+import gc
 import json
 import os
+import warnings
+import weakref
 
+import numpy as np
 import pandas as pd
 import pytest
 from data_adapter.databus import download_collection
 from data_adapter.preprocessing import Adapter
 from data_adapter.structure import Structure
+from datapackage import Package
 from oemof.solph import EnergySystem
 from oemof.tabular.datapackage import Model
 from oemof.tabular.facades import Bus, Commodity, Dispatchable, Load, Storage, Volatile
@@ -13,7 +18,12 @@ from pandas import Timestamp
 from setup_mock import define_mock
 from utils import PATH_TEST_FILES, check_if_csv_dirs_equal
 
-from data_adapter_oemof.build_datapackage import DataPackage
+from data_adapter_oemof.adapters import VolatileAdapter
+from data_adapter_oemof.build_datapackage import (
+    DESCRIPTOR_COMPRESSIONS,
+    DataPackage,
+    Scenario,
+)
 
 path_default = PATH_TEST_FILES / "_files"
 
@@ -45,6 +55,281 @@ def test_build_datapackage():
     )
 
 
+def test_build_datapackage_with_prefetch():
+    """
+    Reading processes ahead in background must not change the datapackage
+    """
+    test_path = os.path.join(path_default, "build_datapackage_test")
+    goal_path = os.path.join(path_default, "build_datapackage_goal")
+
+    mock = define_mock()
+
+    result = DataPackage.build_datapackage(
+        adapter=mock.mock_adapter,
+        process_adapter_map=mock.process_adapter_map,
+        parameter_map=mock.parameter_map,
+        prefetch=2,
+    )
+    assert list(result.parametrized_elements.keys())[1:] == list(
+        mock.mock_adapter.structure.processes.keys()
+    )
+    result.save_datapackage_to_csv(test_path)
+
+    check_if_csv_dirs_equal(goal_path, test_path)
+
+
+def test_build_datapackage_with_cache(tmp_path):
+    """
+    Second build of the same collection is read from cache
+    """
+    pytest.importorskip("pyarrow")
+    test_path = os.path.join(path_default, "build_datapackage_test")
+    goal_path = os.path.join(path_default, "build_datapackage_goal")
+
+    mock = define_mock()
+    # Cache key is derived from files of an existing collection
+    mock.mock_adapter.collection_name = "test_fill_nans"
+
+    for _ in range(2):
+        result = DataPackage.build_datapackage(
+            adapter=mock.mock_adapter,
+            process_adapter_map=mock.process_adapter_map,
+            parameter_map=mock.parameter_map,
+            cache_dir=tmp_path,
+        )
+        assert mock.mock_adapter.get_process.call_count == len(
+            mock.mock_adapter.structure.processes
+        )
+    result.save_datapackage_to_csv(test_path)
+
+    check_if_csv_dirs_equal(goal_path, test_path)
+
+
+def test_process_cache_round_trip(tmp_path):
+    """
+    Tuple labels are cached unwrapped, data changed by parquet round trip is not
+    cached
+    """
+    pytest.importorskip("pyarrow")
+    from unittest import mock
+
+    from data_adapter_oemof.cache import ProcessCache
+
+    timeseries = pd.DataFrame(
+        [[1.0, 2.0], [3.0, 4.0]],
+        index=pd.DatetimeIndex(["2016-01-01 00:00", "2016-01-01 01:00"]),
+        columns=pd.MultiIndex.from_tuples(
+            [(("onshore",), ("BB",)), (("onshore",), ("HH",))]
+        ),
+    )
+    process_data = mock.Mock(
+        scalars=pd.DataFrame({"region": ["BB"], "year": [2016]}),
+        timeseries=timeseries,
+    )
+    adapter = mock.Mock(spec=Adapter)
+    adapter.get_process.return_value = process_data
+    adapter.structure = mock.Mock(process_sheet="Processes_O1")
+    cache = ProcessCache(adapter, tmp_path, collection_dir=tmp_path / "collection")
+
+    # Tuple labels are unwrapped and cached
+    unwrapped_columns = pd.MultiIndex.from_tuples(
+        [("onshore", "BB"), ("onshore", "HH")]
+    )
+    for _ in range(2):
+        cached = cache.get_process("wind")
+        assert cached.timeseries.columns.equals(unwrapped_columns)
+        np.testing.assert_array_equal(cached.timeseries, timeseries)
+    assert adapter.get_process.call_count == 1
+
+    # List cells do not survive the round trip, process is not cached again
+    process_data.scalars = pd.DataFrame({"region": ["BB"], "capacity": [[1.0, 2.0]]})
+    with pytest.warns(UserWarning, match="Could not cache process"):
+        cache.get_process("pv")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        cached = cache.get_process("pv")
+    assert adapter.get_process.call_count == 3
+    assert cached.scalars["capacity"][0] == [1.0, 2.0]
+
+    # Other structure sheets use another cache
+    adapter.structure.process_sheet = "Processes_O2"
+    other_cache = ProcessCache(
+        adapter, tmp_path, collection_dir=tmp_path / "collection"
+    )
+    assert other_cache.cache_dir != cache.cache_dir
+
+
+def test_build_datapackage_with_filters():
+    """
+    Only selected processes are read and only selected years are kept
+    """
+    mock = define_mock()
+
+    result = DataPackage.build_datapackage(
+        adapter=mock.mock_adapter,
+        process_adapter_map=mock.process_adapter_map,
+        parameter_map=mock.parameter_map,
+        processes=["modex_tech_wind_*", "modex_tech_Load"],
+        regions=["BB"],
+        years=[2016, 2030],
+    )
+    assert mock.mock_adapter.get_process.call_count == 2
+    assert list(result.parametrized_elements.keys()) == [
+        "bus",
+        "modex_tech_wind_turbine_onshore",
+        "modex_tech_Load",
+    ]
+    for sequence in result.parametrized_sequences.values():
+        assert set(pd.to_datetime(sequence.index).year) == {2016, 2030}
+    assert list(result.periods["periods"].unique()) == [0, 1]
+
+    # No data for other regions
+    result = DataPackage.build_datapackage(
+        adapter=mock.mock_adapter,
+        process_adapter_map=mock.process_adapter_map,
+        parameter_map=mock.parameter_map,
+        regions=["HH"],
+    )
+    assert list(result.parametrized_elements.keys()) == ["bus"]
+    assert result.parametrized_sequences == {}
+
+
+def test_filter_process_data_by_region():
+    from data_adapter_oemof.build_datapackage import _filter_process_data
+    from data_adapter_oemof.utils import flatten_timeseries_columns
+
+    scalars = pd.DataFrame({"region": ["BB", "DE_north", "HH"], "year": 2016})
+    index = pd.date_range("2016-01-01", periods=2, freq="h")
+    multiindex_timeseries = pd.DataFrame(
+        np.ones((2, 4)),
+        index=index,
+        columns=pd.MultiIndex.from_tuples(
+            [
+                (("wind",), ("DE_north",)),
+                (("wind",), ("HH",)),
+                ("load", "BB"),
+                ("load", np.nan),
+            ]
+        ),
+    )
+    _, filtered = _filter_process_data(
+        scalars, multiindex_timeseries, regions=["BB", "DE_north"]
+    )
+    assert list(filtered.columns) == [
+        (("wind",), ("DE_north",)),
+        ("load", "BB"),
+        ("load", np.nan),
+    ]
+    # Column without region is not labelled with a filtered-out region
+    assert flatten_timeseries_columns(filtered.columns).tolist() == [
+        "wind_DE_north",
+        "load_BB",
+        "load",
+    ]
+
+    # Flat columns are filtered by region suffix, columns without region are kept
+    flat_timeseries = pd.DataFrame(
+        np.ones((2, 4)),
+        index=index,
+        columns=["wind_DE_north", "wind_north", "wind_HH", "Load"],
+    )
+    filtered_scalars, filtered = _filter_process_data(
+        scalars, flat_timeseries, regions=["BB", "DE_north"]
+    )
+    assert list(filtered_scalars["region"]) == ["BB", "DE_north"]
+    assert list(filtered.columns) == ["wind_DE_north", "wind_north", "Load"]
+
+
+def test_build_datapackage_aligns_timeseries():
+    """
+    All sequences share one timeindex, misaligned timeseries are rejected
+    """
+    mock = define_mock()
+    get_process = mock.mock_adapter.get_process.side_effect
+
+    def get_reversed_process(process_name):
+        process = get_process(process_name)
+        if process_name == "modex_tech_Load":
+            process.timeseries = process.timeseries.iloc[::-1]
+        return process
+
+    mock.mock_adapter.get_process.side_effect = get_reversed_process
+    result = DataPackage.build_datapackage(
+        adapter=mock.mock_adapter,
+        process_adapter_map=mock.process_adapter_map,
+        parameter_map=mock.parameter_map,
+    )
+    sequences = list(result.parametrized_sequences.values())
+    assert all(sequence.index is sequences[0].index for sequence in sequences)
+    load = result.parametrized_sequences["modex_tech_Load"]["Load_BB"]
+    assert load.iloc[:3].tolist() == [1.0, 1.0, 1.16]
+
+    def get_shifted_process(process_name):
+        process = get_process(process_name)
+        if process_name == "modex_tech_Load":
+            process.timeseries.index = process.timeseries.index.str.replace(
+                "T01", "T03"
+            )
+        return process
+
+    mock.mock_adapter.get_process.side_effect = get_shifted_process
+    with pytest.raises(ValueError, match="modex_tech_Load"):
+        DataPackage.build_datapackage(
+            adapter=mock.mock_adapter,
+            process_adapter_map=mock.process_adapter_map,
+            parameter_map=mock.parameter_map,
+        )
+
+
+def test_build_scenarios():
+    """
+    Scenarios share process data and only re-adapt affected processes
+    """
+    test_path = os.path.join(path_default, "build_datapackage_test")
+    goal_path = os.path.join(path_default, "build_datapackage_goal")
+
+    mock = define_mock()
+    wind_parameter_map = dict(mock.parameter_map)
+    wind_parameter_map["modex_tech_wind_turbine_onshore"] = {
+        "profile": "onshore",
+        # Keys are facade fields, values are columns of the collection data
+        "fixed_costs": "lifetime",
+    }
+    datapackages = DataPackage.build_scenarios(
+        adapter=mock.mock_adapter,
+        scenarios={
+            "base": Scenario(),
+            "long_lifetime": Scenario(
+                scalars={"modex_tech_photovoltaic_utility": {"lifetime": 40}}
+            ),
+            "wind_costs": Scenario(parameter_map=wind_parameter_map),
+        },
+        process_adapter_map=mock.process_adapter_map,
+        parameter_map=mock.parameter_map,
+    )
+    # Collection data is read once
+    assert mock.mock_adapter.get_process.call_count == len(
+        mock.mock_adapter.structure.processes
+    )
+    datapackages["base"].save_datapackage_to_csv(test_path)
+    check_if_csv_dirs_equal(goal_path, test_path)
+
+    base = datapackages["base"].parametrized_elements
+    long_lifetime = datapackages["long_lifetime"].parametrized_elements
+    wind_costs = datapackages["wind_costs"].parametrized_elements
+    assert long_lifetime["modex_tech_Load"] is base["modex_tech_Load"]
+    assert wind_costs["modex_tech_photovoltaic_utility"] is (
+        base["modex_tech_photovoltaic_utility"]
+    )
+    assert long_lifetime["modex_tech_photovoltaic_utility"]["lifetime"][0] == 40
+    assert base["modex_tech_photovoltaic_utility"]["lifetime"][0] == 25
+    wind = wind_costs["modex_tech_wind_turbine_onshore"]
+    base_wind = base["modex_tech_wind_turbine_onshore"]
+    assert wind is not base_wind
+    assert not wind.equals(base_wind)
+    assert not np.array_equal(wind["fixed_costs"][0], base_wind["fixed_costs"][0])
+
+
 def test_build_tabular_datapackage_from_adapter():
     download_collection(
         "https://databus.openenergyplatform.org/felixmaur/collections/hack-a-thon/"
@@ -128,6 +413,206 @@ def test_read_datapackage():
     assert model, model
 
 
+def test_datapackage_from_directory(tmp_path):
+    goal_path = os.path.join(path_default, "tsam_goal")
+    datapackage = DataPackage.from_directory(goal_path)
+
+    assert datapackage.adapter is None
+    assert set(datapackage.parametrized_sequences) == {
+        "modex_tech_Load",
+        "modex_tech_wind_turbine_onshore",
+        "modex_tech_photovoltaic_utility",
+    }
+    for sequence in datapackage.parametrized_sequences.values():
+        assert isinstance(sequence.index, pd.DatetimeIndex)
+        assert sequence.index.tz is None
+        assert (sequence.dtypes == "float64").all()
+    assert "modex_tech_storage_battery" in datapackage.foreign_keys
+
+    datapackage.save_datapackage_to_csv(str(tmp_path))
+    check_if_csv_dirs_equal(goal_path, str(tmp_path))
+
+
+def test_save_datapackage_with_chunked_sequences(tmp_path):
+    goal_path = os.path.join(path_default, "tsam_goal")
+    datapackage = DataPackage.from_directory(goal_path)
+    datapackage.save_datapackage_to_csv(str(tmp_path), chunksize=7)
+    check_if_csv_dirs_equal(goal_path, str(tmp_path))
+
+    sequence_file = os.path.join("data", "sequences", "modex_tech_Load_sequence.csv")
+    with open(os.path.join(goal_path, sequence_file)) as goal, open(
+        os.path.join(tmp_path, sequence_file)
+    ) as result:
+        assert goal.read() == result.read()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_save_datapackage_with_compressed_sequences(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    goal_path = os.path.join(path_default, "tsam_goal")
+    compressed_path = str(tmp_path / "compressed")
+    datapackage = DataPackage.from_directory(goal_path)
+    datapackage.save_datapackage_to_csv(
+        compressed_path, chunksize=5, compression=compression
+    )
+
+    with open(os.path.join(compressed_path, "datapackage.json")) as f:
+        resources = {
+            resource["name"]: resource for resource in json.load(f)["resources"]
+        }
+    assert resources["modex_tech_Load_sequence"]["compression"] == (
+        DESCRIPTOR_COMPRESSIONS[compression]
+    )
+    if compression == "gzip":
+        # gz compressed resources can be read by datapackage (tabulator)
+        package = Package(os.path.join(compressed_path, "datapackage.json"))
+        assert package.get_resource("modex_tech_Load_sequence").read(limit=1)
+
+    # Decompressed datapackage equals original one
+    decompressed_path = str(tmp_path / "decompressed")
+    DataPackage.from_directory(compressed_path).save_datapackage_to_csv(
+        decompressed_path
+    )
+    check_if_csv_dirs_equal(goal_path, decompressed_path)
+
+
+def test_save_datapackage_reports_progress(tmp_path):
+    goal_path = os.path.join(path_default, "tsam_goal")
+    datapackage = DataPackage.from_directory(goal_path)
+    reported = []
+    datapackage.save_datapackage_to_csv(str(tmp_path), progress=reported.append)
+
+    total = len(datapackage.parametrized_elements) + len(
+        datapackage.parametrized_sequences
+    )
+    assert [progress.done for progress in reported] == list(range(1, total + 1))
+    assert all(progress.stage == "save" for progress in reported)
+    assert reported[-1].total == total
+    assert reported[-1].bytes == sum(
+        os.path.getsize(os.path.join(directory, file_name))
+        for directory, _, file_names in os.walk(tmp_path / "data")
+        for file_name in file_names
+        if directory.endswith(("elements", "sequences"))
+    )
+
+
+def test_split_timeseries_into_years():
+    sequence = pd.DataFrame(
+        {"a": [1.0, 2.0, 3.0, 4.0]},
+        index=pd.to_datetime(
+            [
+                "2016-01-01 00:00",
+                "2016-01-01 01:00",
+                "2030-01-01 00:00",
+                "2050-01-01 00:00",
+            ]
+        ),
+    )
+    split_sequences = DataPackage.split_timeseries_into_years({"process": sequence})
+
+    assert list(split_sequences["process"]) == [2016, 2030, 2050]
+    assert split_sequences["process"][2016]["a"].tolist() == [1.0, 2.0]
+    assert np.shares_memory(
+        split_sequences["process"][2030].to_numpy(), sequence.to_numpy()
+    )
+
+
+def test_save_datapackage_with_sequences_split_by_year(tmp_path):
+    goal_path = os.path.join(path_default, "tsam_goal")
+    split_path = str(tmp_path / "split")
+    datapackage = DataPackage.from_directory(goal_path)
+    datapackage.save_datapackage_to_csv(split_path, split_sequences_by_year=True)
+
+    with open(os.path.join(split_path, "datapackage.json")) as f:
+        resources = {
+            resource["name"]: resource for resource in json.load(f)["resources"]
+        }
+    # Yearly files are parts of a single resource per process
+    paths = resources["modex_tech_Load_sequence"]["path"]
+    assert isinstance(paths, list) and len(paths) > 1
+    assert paths[0] == "data/sequences/modex_tech_Load_sequence_2016.csv"
+    assert paths == sorted(paths)
+    assert not any(name.endswith("_2016") for name in resources)
+
+    # Foreign keys of elements reference existing sequence resources
+    for resource in resources.values():
+        for foreign_key in resource["schema"].get("foreignKeys", []):
+            assert foreign_key["reference"]["resource"] in resources
+    package = Package(os.path.join(split_path, "datapackage.json"))
+    rows = package.get_resource("modex_tech_Load_sequence").read()
+    assert len(rows) == len(datapackage.parametrized_sequences["modex_tech_Load"])
+
+    # Joined datapackage equals original one
+    joined_path = str(tmp_path / "joined")
+    DataPackage.from_directory(split_path).save_datapackage_to_csv(joined_path)
+    check_if_csv_dirs_equal(goal_path, joined_path)
+
+
+def test_resource_hashes_do_not_keep_replaced_frames():
+    datapackage = DataPackage.from_directory(os.path.join(path_default, "tsam_goal"))
+    load = datapackage.parametrized_elements["modex_tech_Load"]
+    load_hash = datapackage.get_resource_hash("modex_tech_Load")
+    assert datapackage.get_resource_hash("modex_tech_Load") == load_hash
+
+    replaced = weakref.ref(load)
+    datapackage.parametrized_elements["modex_tech_Load"] = load.assign(region="HH")
+    del load
+    gc.collect()
+    assert replaced() is None
+    assert datapackage.get_resource_hash("modex_tech_Load") != load_hash
+
+
+def test_validate_foreign_keys(tmp_path):
+    datapackage = DataPackage.from_directory(os.path.join(path_default, "tsam_goal"))
+    assert datapackage.validate_foreign_keys() == []
+
+    bus = datapackage.parametrized_elements["bus"]
+    datapackage.parametrized_elements["bus"] = bus[bus["name"] != "ch4"]
+    datapackage.parametrized_sequences["modex_tech_wind_turbine_onshore"].columns = [
+        "offshore_BB"
+    ]
+    violations = datapackage.validate_foreign_keys()
+    assert len(violations) == 2
+    assert "fuel_bus" in violations[0] and "ch4" in violations[0]
+    assert "onshore_BB" in violations[1]
+
+    with pytest.raises(ValueError, match="Invalid foreign keys"):
+        datapackage.save_datapackage_to_csv(str(tmp_path), validate=True)
+    assert not os.listdir(tmp_path)
+
+
+def test_save_delta_datapackage(tmp_path):
+    goal_path = os.path.join(path_default, "tsam_goal")
+    base = DataPackage.from_directory(goal_path)
+    base.location_to_save_to = str(tmp_path / "base")
+    base.save_datapackage_to_csv()
+
+    scenario = DataPackage.from_directory(goal_path)
+    load = scenario.parametrized_elements["modex_tech_Load"]
+    scenario.parametrized_elements["modex_tech_Load"] = load.assign(region="HH")
+    scenario.save_datapackage_to_csv(str(tmp_path / "scenario"), base=base)
+
+    # Only changed resources are written
+    elements = os.listdir(tmp_path / "scenario" / "data" / "elements")
+    assert elements == ["modex_tech_Load.csv"]
+    assert not os.listdir(tmp_path / "scenario" / "data" / "sequences")
+    with open(tmp_path / "scenario" / "datapackage.json") as f:
+        resources = {
+            resource["name"]: resource for resource in json.load(f)["resources"]
+        }
+    assert resources["modex_tech_Load"]["path"] == ("data/elements/modex_tech_Load.csv")
+    assert resources["modex_tech_Load_sequence"]["path"] == (
+        "../base/data/sequences/modex_tech_Load_sequence.csv"
+    )
+
+    delta = DataPackage.from_directory(str(tmp_path / "scenario"))
+    assert set(delta.parametrized_elements) == set(base.parametrized_elements)
+    assert set(delta.parametrized_sequences) == set(base.parametrized_sequences)
+    assert delta.parametrized_elements["modex_tech_Load"]["region"][0] == "HH"
+    assert delta.foreign_keys == base.foreign_keys
+
+
 def test_period_csv_creation():
     sequence_created = DataPackage.get_periods_from_parametrized_sequences(
         {
@@ -180,6 +665,27 @@ def test_period_csv_creation():
     pd.testing.assert_frame_equal(sequence_goal, sequence_created, check_dtype=False)
 
 
+def test_period_csv_creation_with_quarter_hours():
+    timeindex = pd.date_range("2016-01-01", periods=3, freq="15min").append(
+        pd.date_range("2030-01-01", periods=2, freq="15min")
+    )
+    periods = DataPackage.get_periods_from_parametrized_sequences(
+        {"wind_power": pd.DataFrame({"onshore_BB": range(5)}, index=timeindex)}
+    )
+    assert periods["periods"].tolist() == [0, 0, 0, 1, 1]
+    assert periods["timeincrement"].tolist() == [0.25] * 5
+
+    with pytest.raises(ValueError, match="wind_power_HH"):
+        DataPackage.get_periods_from_parametrized_sequences(
+            {
+                "wind_power": pd.DataFrame({"onshore_BB": range(5)}, index=timeindex),
+                "wind_power_HH": pd.DataFrame(
+                    {"onshore_HH": range(4)}, index=timeindex[:4]
+                ),
+            }
+        )
+
+
 def test_tsam():
     """
     Uses Mock to create datapackage and then applies timeseries aggregation to it.
@@ -215,6 +721,132 @@ def test_tsam():
     check_if_csv_dirs_equal(tsam_folder, os.path.join(tsam_folder, "..", "tsam_goal"))
 
 
+def test_tsam_reuses_identical_periods(tmp_path, monkeypatch):
+    from data_adapter_oemof import build_datapackage
+
+    aggregated_sequences = []
+    aggregation_class = build_datapackage.tsam.TimeSeriesAggregation
+
+    def count_aggregations(time_series, **kwargs):
+        aggregated_sequences.append(time_series)
+        return aggregation_class(time_series, **kwargs)
+
+    monkeypatch.setattr(
+        build_datapackage.tsam, "TimeSeriesAggregation", count_aggregations
+    )
+
+    datapackage = DataPackage.from_directory(os.path.join(path_default, "tsam_goal"))
+    # Same "weather year" in 2016 and 2030, different one in 2050
+    values = [1.0, 3.0, 2.0, 5.0, 4.0, 6.0]
+    timeindex = pd.DatetimeIndex(
+        [
+            f"{year}-01-01 {hour:02d}:00"
+            for year in (2016, 2030, 2050)
+            for hour in range(6)
+        ]
+    )
+    datapackage.parametrized_sequences = {
+        process_name: pd.DataFrame(
+            {column: values * 2 + values[::-1] for column in sequence.columns},
+            index=timeindex,
+        )
+        for process_name, sequence in datapackage.parametrized_sequences.items()
+    }
+    with open(os.path.join(path_default, "tsam", "tsam_config.json"), "r") as f:
+        tsam_config = json.load(f)
+
+    datapackage.time_series_aggregation(
+        tsam_config=tsam_config, location_to_save_to=str(tmp_path)
+    )
+
+    # Periods 2016 and 2030 are clustered once
+    assert [sequence.index[0].year for sequence in aggregated_sequences] == [
+        2016,
+        2050,
+    ]
+    sequence = datapackage.parametrized_sequences["modex_tech_Load"]
+    assert (
+        sequence[sequence.index.year == 2016].to_numpy()
+        == sequence[sequence.index.year == 2030].to_numpy()
+    ).all()
+    assert datapackage.tsa_parameters["timesteps_per_period"].nunique() == 1
+
+
+def test_tsam_timeincrement_from_segment_durations(tmp_path, monkeypatch):
+    from data_adapter_oemof import build_datapackage
+
+    class SegmentedAggregation:
+        """Aggregates every period to two segments lasting 2h and 4h"""
+
+        resolution = 2.0
+
+        def __init__(self, time_series, **kwargs):
+            self.time_series = time_series
+            self.hoursPerPeriod = 12
+            self.clusterOrder = [0]
+            self.timeIndex = time_series.index
+
+        def createTypicalPeriods(self):
+            return pd.DataFrame(
+                self.time_series.iloc[:2].to_numpy(),
+                columns=self.time_series.columns,
+                index=pd.MultiIndex.from_tuples(
+                    [(0, 0, 1), (0, 1, 2)],
+                    names=["PeriodNum", "Segment Step", "Segment Duration"],
+                ),
+            )
+
+    monkeypatch.setattr(
+        build_datapackage.tsam, "TimeSeriesAggregation", SegmentedAggregation
+    )
+    datapackage = DataPackage.from_directory(os.path.join(path_default, "tsam_goal"))
+    tsam_config = [{"segmentation": True}] * datapackage.periods["periods"].nunique()
+    datapackage.time_series_aggregation(
+        tsam_config=tsam_config, location_to_save_to=str(tmp_path)
+    )
+
+    assert datapackage.periods["timeincrement"].tolist() == [2, 4] * len(tsam_config)
+    periods = pd.read_csv(tmp_path / "data" / "periods" / "periods.csv", sep=";")
+    assert periods["timeincrement"].tolist() == [2, 4] * len(tsam_config)
+
+
+def test_sweep_time_series_aggregation():
+    datapackage = DataPackage.from_directory(os.path.join(path_default, "tsam_goal"))
+    timeindex = pd.date_range("2016-01-01", periods=48, freq="h").append(
+        pd.date_range("2030-01-01", periods=48, freq="h")
+    )
+    rng = np.random.default_rng(0)
+    datapackage.parametrized_sequences = {
+        process_name: pd.DataFrame(
+            rng.random((len(timeindex), len(sequence.columns))),
+            index=timeindex,
+            columns=sequence.columns,
+        )
+        for process_name, sequence in datapackage.parametrized_sequences.items()
+    }
+    sequences = {
+        process_name: sequence.copy()
+        for process_name, sequence in datapackage.parametrized_sequences.items()
+    }
+    periods = datapackage.periods
+    tsam_config = [{"hoursPerPeriod": 1, "clusterMethod": "hierarchical"}] * 2
+
+    sweep = datapackage.sweep_time_series_aggregation(
+        tsam_config, grid={"noTypicalPeriods": [12, 4, 8]}, max_workers=2
+    )
+
+    assert list(sweep["noTypicalPeriods"]) == [4, 8, 12]
+    assert list(sweep["timesteps"]) == [8, 16, 24]
+    assert {"RMSE", "RMSE_duration", "MAE"} <= set(sweep.columns)
+    assert sweep["RMSE"].iloc[0] >= sweep["RMSE"].iloc[-1]
+    # Sweep leaves datapackage untouched
+    assert datapackage.periods is periods
+    for process_name, sequence in sequences.items():
+        pd.testing.assert_frame_equal(
+            datapackage.parametrized_sequences[process_name], sequence
+        )
+
+
 @pytest.mark.skip(reason="Waiting for registered helper set on databus")
 def test_decomissioning():
     """
@@ -265,9 +897,10 @@ def test_filling_nans():
         ][0]
         == 1.5774000000000008
     )
+    # Periodic values are stored as numpy arrays
     assert data_package.parametrized_elements["ind_steel_hyddri_1"][
         "conversion_factor_sec_elec_ind"
-    ][0] == [
+    ][0].tolist() == [
         0.7000000000000001,
         0.7000000000000001,
         0.7000000000000001,
@@ -282,3 +915,34 @@ def test_filling_nans():
 
 
 # Check wheter result would be correct
+
+
+def test_get_foreign_keys():
+    adapter = VolatileAdapter(
+        process_name="modex_tech_wind_turbine_onshore",
+        # Scalar fixed costs, as the single timeseries column would be used as
+        # fixed costs if the facade types them as sequence
+        data={"name": "BB_onshore", "region": "BB", "fixed_costs": 10.0},
+        timeseries=pd.DataFrame({"onshore_BB": [1, 2, 3]}),
+        structure={"inputs": [], "outputs": ["electricity"]},
+        parameter_map={"modex_tech_wind_turbine_onshore": {"profile": "onshore"}},
+        bus_map={},
+    )
+    expected = [
+        {"fields": "bus", "reference": {"fields": "name", "resource": "bus"}},
+        {
+            "fields": "profile",
+            "reference": {"resource": "modex_tech_wind_turbine_onshore_sequence"},
+        },
+    ]
+    assert DataPackage.get_foreign_keys(adapter, [adapter.facade_dict]) == expected
+
+    # Profile of second component is missing in timeseries
+    with pytest.warns(UserWarning, match="Not all profile columns are set"):
+        foreign_keys = DataPackage.get_foreign_keys(
+            adapter, [adapter.facade_dict, {"profile": "onshore_HH"}]
+        )
+    assert foreign_keys == expected
+
+    # Scalar profiles do not reference sequences
+    assert DataPackage.get_foreign_keys(adapter, [{"profile": 0.5}]) == expected[:1]
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.tools.economics import annuity
+
+from data_adapter_oemof.calculations import (
+    CalculationError,
+    capacity_cost_frame,
+    decommission,
+    decommission_frame,
+    floor_lifetime_frame,
+    get_capacity_cost,
+    normalize_activity_bonds_frame,
+)
+
+
+def test_decommission_frame():
+    elements = pd.DataFrame(
+        [
+            {
+                "capacity": np.array([10.0, 5.0, 0.0]),
+                "output_parameters": {"max": np.array([1.0, 0.5, 0.5])},
+            },
+            {"capacity": np.array([4.0, 2.0, 1.0])},
+            {"capacity": 7.0},
+        ]
+    )
+    decommissioned = decommission_frame("ind_steel_casting_0", elements)
+
+    for row, component in enumerate(elements.to_dict(orient="records")):
+        if not isinstance(component["output_parameters"], dict):
+            component["output_parameters"] = {}
+        expected = decommission("ind_steel_casting_0", component)
+        assert decommissioned["capacity"][row] == expected["capacity"]
+        if "max" in expected["output_parameters"]:
+            np.testing.assert_array_equal(
+                decommissioned["output_parameters"][row]["max"],
+                expected["output_parameters"]["max"],
+            )
+        else:
+            assert np.isnan(decommissioned["output_parameters"][row])
+
+
+def test_floor_lifetime_frame():
+    elements = pd.DataFrame({"lifetime": [np.array([20.4, 20.4]), 30.7, np.nan]})
+    floored = floor_lifetime_frame(elements)
+    assert floored["lifetime"].tolist()[:2] == [20, 30]
+    assert pd.isna(floored["lifetime"][2])
+
+    with pytest.warns(UserWarning, match="Lifetime cannot change"):
+        floored = floor_lifetime_frame(
+            pd.DataFrame({"lifetime": [np.array([20.0, 25.0]), 30.0]})
+        )
+    assert floored["lifetime"].tolist() == [20, 30]
+
+
+def test_normalize_activity_bonds_frame():
+    scalars = pd.DataFrame(
+        {
+            "activity_bound_fix": [np.array([1.0, 2.0]), 3.0, 4.0],
+            "capacity_w_inst_0": [2.0, np.array([3.0, 0.0]), 0.0],
+        }
+    )
+    normalized = normalize_activity_bonds_frame(scalars, "capacity_w_inst_0")
+    np.testing.assert_array_equal(normalized["activity_bound_fix"][0], [0.5, 1.0])
+    np.testing.assert_array_equal(normalized["activity_bound_fix"][1], [1.0, 0.0])
+    assert normalized["activity_bound_fix"][2] == 0
+
+
+def test_capacity_cost_frame():
+    scalars = pd.DataFrame(
+        {
+            "cost_inv_w": [np.array([1000.0, 900.0]), 1000.0],
+            "lifetime": [20, 20],
+            "wacc": [0.05, 0.05],
+            "fixed_costs": [5.0, np.nan],
+        }
+    )
+    calculated = capacity_cost_frame(
+        scalars,
+        capacity_cost_column="capital_costs",
+        overnight_cost_column="cost_inv_w",
+        fixed_cost_column="fixed_costs",
+        lifetime_column="lifetime",
+        wacc_column="wacc",
+    )
+    np.testing.assert_allclose(
+        calculated["capital_costs"][0],
+        [annuity(1000, 20, 0.05) + 5, annuity(900, 20, 0.05) + 5],
+    )
+    assert calculated["capital_costs"][1] == pytest.approx(annuity(1000, 20, 0.05))
+
+    # Fractional lifetimes are not rounded
+    scalars["lifetime"] = 20.5
+    calculated = capacity_cost_frame(
+        scalars, "capital_costs", "cost_inv_w", "fixed_costs", "lifetime", "wacc"
+    )
+    assert calculated["capital_costs"][1] == pytest.approx(annuity(1000, 20.5, 0.05))
+
+    # Given capacity costs are not overwritten
+    scalars["capital_costs"] = 1.0
+    assert (
+        capacity_cost_frame(
+            scalars, "capital_costs", "cost_inv_w", "fixed_costs", "lifetime", "wacc"
+        )
+        is scalars
+    )
+
+
+@pytest.mark.parametrize(
+    "lifetime, wacc", [(0, 0.05), (np.nan, 0.05), (20, 5), (20, -0.01)]
+)
+def test_capacity_cost_out_of_bounds(lifetime, wacc, caplog):
+    scalars = pd.DataFrame(
+        {
+            "cost_inv_w": [1000.0, 1000.0],
+            "lifetime": [lifetime, 20],
+            "wacc": [wacc, 0.05],
+        }
+    )
+    calculated = capacity_cost_frame(
+        scalars,
+        "capital_costs",
+        "cost_inv_w",
+        "fixed_costs",
+        "lifetime",
+        "wacc",
+        process_name="wind",
+    )
+    # Invalid row is left NaN, other rows are calculated
+    assert np.isnan(calculated["capital_costs"][0])
+    assert calculated["capital_costs"][1] == pytest.approx(annuity(1000, 20, 0.05))
+    assert len(caplog.records) == 1
+    assert caplog.records[0].process_name == "wind"
+    assert "rows [0]" in caplog.text
+
+
+def test_annuity_out_of_bounds():
+    with pytest.raises(CalculationError, match="out of bounds"):
+        get_capacity_cost(1000.0, 0.0, [20, 0], 0.05)
@@ -0,0 +1,52 @@
+import pstats
+
+from data_adapter_oemof import cli
+
+
+def test_parse_build_arguments():
+    args = cli.get_parser().parse_args(
+        [
+            "build",
+            "steel_industry_test",
+            "--structure",
+            "SEDOS_Modellstruktur",
+            "-o",
+            "datapackage",
+            "--years",
+            "2016",
+            "2030",
+            "--prefetch",
+            "2",
+            "--workers",
+            "4",
+            "--format",
+            "csv.gz",
+        ]
+    )
+    assert args.func is cli.build_command
+    assert args.collection == "steel_industry_test"
+    assert args.years == [2016, 2030]
+    assert args.prefetch == 2
+    assert args.workers == 4
+    assert cli.OUTPUT_FORMATS[args.format] == "gzip"
+    assert args.tsam_config is None
+
+
+def test_profile_build(tmp_path, monkeypatch):
+    called = []
+    monkeypatch.setattr(cli, "build_command", called.append)
+    profile_file = tmp_path / "build.prof"
+    cli.main(
+        [
+            "build",
+            "steel_industry_test",
+            "--structure",
+            "SEDOS_Modellstruktur",
+            "-o",
+            str(tmp_path),
+            "--profile",
+            str(profile_file),
+        ]
+    )
+    assert len(called) == 1
+    assert pstats.Stats(str(profile_file)).total_calls > 0
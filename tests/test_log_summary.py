@@ -0,0 +1,55 @@
+import logging
+import warnings
+
+import pytest
+
+from data_adapter_oemof.log_summary import summarize_logs
+
+
+def test_summarize_logs(caplog):
+    logger = logging.getLogger()
+    with caplog.at_level(logging.INFO):
+        with summarize_logs("test", limit=2) as summary:
+            for process_name in ("process_a", "process_a", "process_b"):
+                for key in ("capacity", "max", "min"):
+                    logger.info(
+                        "Key not found. Did not map '%s'",
+                        key,
+                        extra={"process_name": process_name},
+                    )
+
+    records = [
+        record
+        for record in caplog.records
+        if record.msg == "Key not found. Did not map '%s'"
+    ]
+    # Only first two records per message and process are passed
+    assert [record.process_name for record in records] == ["process_a"] * 2 + [
+        "process_b"
+    ] * 2
+    assert caplog.records[-1].getMessage() == (
+        "Log summary of test:\n"
+        "INFO 9x: Key not found. Did not map '%s' (process_a: 6, process_b: 3)"
+    )
+    # Filter is removed after build
+    assert summary not in logger.filters
+
+
+def test_summarize_logs_reissues_warnings_once(caplog):
+    with pytest.warns(UserWarning, match="Not all profile columns") as record:
+        with summarize_logs("test"):
+            for _ in range(3):
+                warnings.warn("Not all profile columns are set")
+    assert len(record) == 1
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert "UserWarning 3x: Not all profile columns are set" in caplog.text
+
+
+def test_summarize_logs_on_error(caplog):
+    with pytest.warns(UserWarning, match="Not all profile columns"):
+        with pytest.raises(KeyError):
+            with summarize_logs("test"):
+                warnings.warn("Not all profile columns are set")
+                raise KeyError("capacity")
+    assert "Log summary of test" in caplog.records[-1].getMessage()
+    assert "UserWarning 1x: Not all profile columns are set" in caplog.text
@@ -1,8 +1,16 @@
+import os
 import unittest
 
 import pandas as pd
+import pytest
 
-from data_adapter_oemof.adapters import ExtractionTurbineAdapter, VolatileAdapter
+from data_adapter_oemof.adapters import (
+    ExtractionTurbineAdapter,
+    MappingError,
+    TimeseriesColumns,
+    VolatileAdapter,
+)
+from data_adapter_oemof.structure_mapping import get_process_adapter_map
 
 
 def test_get_with_mapping():
@@ -246,3 +254,56 @@ def test_get_sequence_name():
         "name": "modex_tech_wind_turbine_onshore--6",
     }
     unittest.TestCase().assertDictEqual(expected, adapter.facade_dict)
+
+
+def test_get_sequence_from_timeseries_columns():
+    timeseries_columns = TimeseriesColumns(["onshore_BB", "onshore_HH"])
+    assert timeseries_columns.get_regional("onshore", "HH") == "onshore_HH"
+    assert timeseries_columns.get_regional("onshore", "TH") is None
+
+    adapter = VolatileAdapter(
+        process_name="modex_tech_wind_turbine_onshore",
+        data={"name": "HH_onshore", "region": "HH"},
+        timeseries=timeseries_columns,
+        structure={"inputs": [], "outputs": ["electricity"]},
+        parameter_map={"modex_tech_wind_turbine_onshore": {"profile": "onshore"}},
+        bus_map={},
+    )
+    assert adapter.facade_dict["profile"] == "onshore_HH"
+    assert adapter.timeseries_columns is timeseries_columns
+
+
+def test_get_process_adapter_map(tmp_path):
+    structure_file = tmp_path / "structure.xlsx"
+    with pd.ExcelWriter(structure_file) as writer:
+        pd.DataFrame(
+            {
+                "process": ["ind_steel_casting_0", "ind_steel_hyddri_1"],
+                "facade adapter (oemof)": ["MIMOAdapter", None],
+            }
+        ).to_excel(writer, sheet_name="Processes", index=False)
+        pd.DataFrame(
+            {
+                "process": ["x2x_import_elec"],
+                "facade adapter (oemof)": ["CommodityAdapter"],
+            }
+        ).to_excel(writer, sheet_name="Helper", index=False)
+
+    expected = {
+        "ind_steel_casting_0": "MIMOAdapter",
+        "x2x_import_elec": "CommodityAdapter",
+    }
+    assert get_process_adapter_map(structure_file, "Processes", "Helper") == expected
+    assert get_process_adapter_map(structure_file, "Processes") == {
+        "ind_steel_casting_0": "MIMOAdapter"
+    }
+
+    with pd.ExcelWriter(structure_file) as writer:
+        pd.DataFrame(
+            {"process": ["ind_steel_casting_0"], "facade adapter (oemof)": ["MIMO"]}
+        ).to_excel(writer, sheet_name="Processes", index=False)
+    # Make sure modification is noticed even on file systems with coarse timestamps
+    modification_time = os.path.getmtime(structure_file) + 1
+    os.utime(structure_file, (modification_time, modification_time))
+    with pytest.raises(MappingError, match="Unknown facade adapters"):
+        get_process_adapter_map(structure_file, "Processes")
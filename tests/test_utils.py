@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from data_adapter_oemof.utils import (
+    convert_mixed_types_to_same_length,
+    flatten_timeseries_columns,
+)
+
+
+def test_convert_mixed_types_to_same_length():
+    column = pd.Series(
+        [np.array([1.0, 2.0, 3.0]), 5.0, np.nan, [1.0, 2.0, 3.0]],
+        index=[3, 4, 5, 6],
+        name="capacity",
+    )
+    converted = convert_mixed_types_to_same_length(column)
+
+    assert converted.index.equals(column.index)
+    assert converted.name == "capacity"
+    np.testing.assert_array_equal(converted[3], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(converted[4], [5.0, 5.0, 5.0])
+    assert np.isnan(converted[5])
+    assert isinstance(converted[6], np.ndarray)
+
+    # Columns without periodic values are passed as they are
+    numeric_column = pd.Series([1.0, np.nan])
+    assert convert_mixed_types_to_same_length(numeric_column) is numeric_column
+    string_column = pd.Series(["a", np.nan])
+    assert convert_mixed_types_to_same_length(string_column) is string_column
+
+    # Scalars of different types keep their type
+    converted = convert_mixed_types_to_same_length(
+        pd.Series([np.array([1.0, 2.0]), 1.5, "x"])
+    )
+    assert list(converted[1]) == [1.5, 1.5]
+    assert list(converted[2]) == ["x", "x"]
+
+
+def test_flatten_timeseries_columns():
+    timeseries = pd.DataFrame(
+        [[1.0, 2.0, 3.0]],
+        columns=pd.MultiIndex.from_tuples(
+            [(("onshore",), ("BB",)), (("onshore",), ("HH",)), ("offshore", "BB")]
+        ),
+    )
+    columns = timeseries.columns.copy()
+    flattened = flatten_timeseries_columns(timeseries.columns)
+
+    assert flattened.tolist() == ["onshore_BB", "onshore_HH", "offshore_BB"]
+    assert timeseries.columns.equals(columns)
+    assert flatten_timeseries_columns(pd.Index(["Load_BB"])).tolist() == ["Load_BB"]
+
+
+def test_flatten_timeseries_columns_without_region():
+    columns = pd.MultiIndex.from_tuples([("load", "HH"), ("load", np.nan)])
+    assert flatten_timeseries_columns(columns).tolist() == ["load_HH", "load"]